@@ -7,31 +7,32 @@ Local web server to showcase the complete tank design process.
 """
 
 import http.server
-import socketserver
+import email.utils
+import gzip
+import hashlib
 import webbrowser
 import threading
-import time
 import os
 import markdown
 from pathlib import Path
 from urllib.parse import urlparse
 
-class DocumentationHandler(http.server.SimpleHTTPRequestHandler):
-    
-    def do_GET(self):
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
-        
-        if path == '/' or path == '/index.html':
-            self.serve_main_dashboard()
-        elif path.startswith('/document/'):
-            doc_name = path.split('/')[-1]
-            self.serve_document(doc_name)
-        else:
-            super().do_GET()
-    
-    def serve_main_dashboard(self):
-        html_content = """
+# Prefer GitHub's C cmark parser when installed; fall back to python-markdown
+try:
+    import cmarkgfm
+    from cmarkgfm.cmark import Options as CmarkOptions
+    CMARKGFM_AVAILABLE = True
+except ImportError:
+    CMARKGFM_AVAILABLE = False
+
+# Markdown parsers are costly to build and not thread-safe, so each
+# request-handling thread keeps its own and resets it between documents
+_MARKDOWN = threading.local()
+
+# Rendered document pages keyed by filename -> (mtime, page bytes, gzipped page)
+_DOCUMENT_CACHE = {}
+
+_DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -306,11 +307,122 @@ class DocumentationHandler(http.server.SimpleHTTPRequestHandler):
     </footer>
 </body>
 </html>"""
+_DASHBOARD_BYTES = _DASHBOARD_HTML.encode('utf-8')
+_DASHBOARD_LEN = str(len(_DASHBOARD_BYTES))
+_DASHBOARD_ETAG = f'"{hashlib.md5(_DASHBOARD_BYTES).hexdigest()}"'
+_DASHBOARD_GZIP = gzip.compress(_DASHBOARD_BYTES, compresslevel=9)
+_DASHBOARD_GZIP_LEN = str(len(_DASHBOARD_GZIP))
+_DASHBOARD_GZIP_ETAG = f'"{hashlib.md5(_DASHBOARD_GZIP).hexdigest()}"'
+
+class DocumentationHandler(http.server.SimpleHTTPRequestHandler):
+    
+    # Keep connections open between requests; every response carries a
+    # Content-Length, which HTTP/1.1 keep-alive depends on
+    protocol_version = 'HTTP/1.1'
+    
+    # Buffer response writes so headers go out together with the body
+    wbufsize = 64 * 1024
+    
+    # ETag to attach to the static file response currently being sent
+    static_etag = None
+    
+    # Static files such as the STEP download change rarely, so let browsers
+    # reuse them for an hour like the dashboard
+    static_cache_headers = (('Cache-Control', 'public, max-age=3600'),
+                            ('Vary', 'Accept-Encoding'))
+    
+    def do_GET(self):
+        parsed_path = urlparse(self.path)
+        path = parsed_path.path
+        
+        if path == '/' or path == '/index.html':
+            self.serve_main_dashboard()
+        elif path.startswith('/document/'):
+            doc_name = path.split('/')[-1]
+            self.serve_document(doc_name)
+        else:
+            self.serve_static()
+    
+    def end_headers(self):
+        if self.static_etag:
+            self.send_header('ETag', self.static_etag)
+            for header in self.static_cache_headers:
+                self.send_header(*header)
+            self.static_etag = None
+        super().end_headers()
+    
+    def etag_matches(self, etag):
+        """Weak comparison of etag against the request's If-None-Match"""
+        if_none_match = self.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        opaque = etag.removeprefix('W/')
+        return any(tag.strip() == '*' or tag.strip().removeprefix('W/') == opaque
+                   for tag in if_none_match.split(','))
+    
+    def modified_since(self, mtime):
+        """False if If-Modified-Since shows the client already has mtime"""
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if not if_modified_since or 'If-None-Match' in self.headers:
+            return True
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return True
+        return int(mtime) > since.timestamp()
+    
+    def send_not_modified(self, *headers):
+        self.send_response(304)
+        for header in headers:
+            self.send_header(*header)
+        self.end_headers()
+    
+    def accepts_gzip(self):
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+    
+    def serve_static(self):
+        fs_path = self.translate_path(self.path)
+        if os.path.isfile(fs_path):
+            st = os.stat(fs_path)
+            etag = f'W/"{st.st_size:x}-{int(st.st_mtime):x}"'
+            if self.etag_matches(etag):
+                self.send_not_modified(('ETag', etag), *self.static_cache_headers)
+                return
+            self.static_etag = etag
+        super().do_GET()
+    
+    def copyfile(self, source, outputfile):
+        if outputfile is not self.wfile:
+            return super().copyfile(source, outputfile)
+        
+        # Static downloads such as the STEP file go through sendfile(2);
+        # socket.sendfile() falls back to plain sends for non-file sources.
+        # Flush first so the buffered headers precede the body.
+        outputfile.flush()
+        self.connection.sendfile(source)
+    
+    def serve_main_dashboard(self):
+        if self.accepts_gzip():
+            body, length, etag = _DASHBOARD_GZIP, _DASHBOARD_GZIP_LEN, _DASHBOARD_GZIP_ETAG
+        else:
+            body, length, etag = _DASHBOARD_BYTES, _DASHBOARD_LEN, _DASHBOARD_ETAG
+        
+        cache_headers = (('ETag', etag),
+                         ('Cache-Control', 'public, max-age=3600'),
+                         ('Vary', 'Accept-Encoding'))
+        if self.etag_matches(etag):
+            self.send_not_modified(*cache_headers)
+            return
         
         self.send_response(200)
         self.send_header('Content-type', 'text/html; charset=utf-8')
+        if body is _DASHBOARD_GZIP:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', length)
+        for header in cache_headers:
+            self.send_header(*header)
         self.end_headers()
-        self.wfile.write(html_content.encode('utf-8'))
+        self.wfile.write(body)
     
     def serve_document(self, filename):
         if not os.path.exists(filename):
@@ -318,25 +430,41 @@ class DocumentationHandler(http.server.SimpleHTTPRequestHandler):
             return
         
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                content = f.read()
+            mtime, page, page_gzip = load_document(filename)
             
-            if filename.endswith('.md'):
-                md = markdown.Markdown(extensions=['extra', 'tables'])
-                html_content = md.convert(content)
-            else:
-                html_content = f"<pre>{content}</pre>"
+            # Documents can be edited while the server runs, so let browsers
+            # keep a copy but revalidate it on every view
+            cache_headers = (('Last-Modified', email.utils.formatdate(mtime, usegmt=True)),
+                             ('Cache-Control', 'no-cache'),
+                             ('Vary', 'Accept-Encoding'))
+            if not self.modified_since(mtime):
+                self.send_not_modified(*cache_headers)
+                return
             
-            title = filename.replace('_', ' ').replace('.md', '')
+            self.send_response(200)
+            self.send_header('Content-type', 'text/html; charset=utf-8')
+            if self.accepts_gzip():
+                page = page_gzip
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(page)))
+            for header in cache_headers:
+                self.send_header(*header)
+            self.end_headers()
+            self.wfile.write(page)
             
-            full_html = f"""
+        except Exception as e:
+            self.send_error(500, f"Error: {str(e)}")
+
+# Static pieces of the document page; only the title and rendered body vary
+_DOC_HEAD = """
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
-    <title>{title} - Solprov Engineering</title>
+    <title>""".encode('utf-8')
+_DOC_MID = """ - Solprov Engineering</title>
     <style>
-        body {{
+        body {
             font-family: Arial, sans-serif;
             line-height: 1.6;
             color: #333;
@@ -344,60 +472,60 @@ class DocumentationHandler(http.server.SimpleHTTPRequestHandler):
             margin: 0 auto;
             padding: 20mm;
             background: white;
-        }}
+        }
         
-        @media print {{
-            body {{ margin: 0; padding: 15mm; font-size: 10pt; }}
-            .no-print {{ display: none !important; }}
-        }}
+        @media print {
+            body { margin: 0; padding: 15mm; font-size: 10pt; }
+            .no-print { display: none !important; }
+        }
         
-        h1 {{ color: #1f4e79; border-bottom: 3px solid #1f4e79; padding-bottom: 0.5em; }}
-        h2 {{ color: #2f5f8f; margin-top: 2em; }}
-        h3 {{ color: #365f91; }}
+        h1 { color: #1f4e79; border-bottom: 3px solid #1f4e79; padding-bottom: 0.5em; }
+        h2 { color: #2f5f8f; margin-top: 2em; }
+        h3 { color: #365f91; }
         
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             margin: 1em 0;
             font-size: 0.9em;
-        }}
+        }
         
-        table, th, td {{ border: 1px solid #ddd; }}
+        table, th, td { border: 1px solid #ddd; }
         
-        th {{
+        th {
             background-color: #f8f9fa;
             padding: 8px;
             font-weight: bold;
             text-align: left;
-        }}
+        }
         
-        td {{ padding: 8px; vertical-align: top; }}
+        td { padding: 8px; vertical-align: top; }
         
-        tr:nth-child(even) {{ background-color: #f9f9f9; }}
+        tr:nth-child(even) { background-color: #f9f9f9; }
         
-        code {{
+        code {
             background-color: #f4f4f4;
             padding: 2px 4px;
             border-radius: 3px;
             font-family: Consolas, monospace;
-        }}
+        }
         
-        pre {{
+        pre {
             background-color: #f8f8f8;
             border: 1px solid #ddd;
             border-radius: 4px;
             padding: 1em;
             overflow-x: auto;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 2em;
             padding-bottom: 1em;
             border-bottom: 1px solid #ddd;
-        }}
+        }
         
-        .back-button {{
+        .back-button {
             position: fixed;
             top: 20px;
             left: 20px;
@@ -406,29 +534,70 @@ class DocumentationHandler(http.server.SimpleHTTPRequestHandler):
             padding: 10px 20px;
             text-decoration: none;
             border-radius: 5px;
-        }}
+        }
     </style>
 </head>
 <body>
     <a href="/" class="back-button no-print">← Back</a>
     
     <div class="header">
-        <h1>{title}</h1>
+        <h1>""".encode('utf-8')
+_DOC_BODY = """</h1>
         <p><strong>Solprov Engineering (Pty) Ltd</strong> | Professional Engineering Solutions</p>
         <p>ISO 9001 Certified | August 2025</p>
     </div>
     
-    {html_content}
+    """.encode('utf-8')
+_DOC_TAIL = """
 </body>
-</html>"""
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html; charset=utf-8')
-            self.end_headers()
-            self.wfile.write(full_html.encode('utf-8'))
-            
+</html>""".encode('utf-8')
+
+def render_document(filename):
+    """Render a document to a complete HTML page"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    if filename.endswith('.md') and CMARKGFM_AVAILABLE:
+        # The documents are our own, so keep their inline HTML like markdown does
+        html_content = cmarkgfm.github_flavored_markdown_to_html(
+            content, options=CmarkOptions.CMARK_OPT_UNSAFE)
+    elif filename.endswith('.md'):
+        md = getattr(_MARKDOWN, 'parser', None)
+        if md is None:
+            md = _MARKDOWN.parser = markdown.Markdown(extensions=['extra', 'tables'])
+        html_content = md.reset().convert(content)
+    else:
+        html_content = f"<pre>{content}</pre>"
+    
+    title = filename.replace('_', ' ').replace('.md', '').encode('utf-8')
+    
+    return b''.join([_DOC_HEAD, title, _DOC_MID, title, _DOC_BODY,
+                     html_content.encode('utf-8'), _DOC_TAIL])
+
+def _cache_entry(filename):
+    """Render filename into the (mtime, page, gzipped page) tuple kept in the cache"""
+    mtime = os.path.getmtime(filename)
+    page = render_document(filename)
+    return (mtime, page, gzip.compress(page, compresslevel=9))
+
+def load_document(filename):
+    """Return (mtime, page, gzipped page) for filename, re-rendering it if the file changed"""
+    cached = _DOCUMENT_CACHE.get(filename)
+    if cached and cached[0] == os.path.getmtime(filename):
+        return cached
+    
+    cached = _cache_entry(filename)
+    _DOCUMENT_CACHE[filename] = cached
+    return cached
+
+def prerender_documents():
+    """Render every markdown document once so requests are served from memory"""
+    for path in sorted(Path('.').glob('*.md')):
+        try:
+            _DOCUMENT_CACHE[path.name] = _cache_entry(path.name)
         except Exception as e:
-            self.send_error(500, f"Error: {str(e)}")
+            print(f"Could not pre-render {path.name}: {e}")
+    return len(_DOCUMENT_CACHE)
 
 def start_server():
     PORT = 8080
@@ -447,17 +616,15 @@ def start_server():
     
     os.chdir(Path(__file__).parent)
     
-    with socketserver.TCPServer(("", PORT), DocumentationHandler) as httpd:
+    print(f"Pre-rendered {prerender_documents()} documents")
+    
+    with http.server.ThreadingHTTPServer(("", PORT), DocumentationHandler) as httpd:
         print(f"Server running at http://localhost:{PORT}")
         print("Opening browser...")
         
-        def open_browser():
-            time.sleep(2)
-            webbrowser.open(f'http://localhost:{PORT}')
-        
-        browser_thread = threading.Thread(target=open_browser)
-        browser_thread.daemon = True
-        browser_thread.start()
+        # The socket is already bound and listening, so the browser's first
+        # request simply waits in the backlog until serve_forever() starts
+        webbrowser.open(f'http://localhost:{PORT}')
         
         try:
             print("\nServer Status: ACTIVE")
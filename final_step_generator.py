@@ -10,71 +10,87 @@ This final version uses correct export methods for reliable STEP file generation
 """
 
 from build123d import *
+from OCP.BRep import BRep_Builder
+from OCP.BRepTools import BRepTools
+from OCP.TopoDS import TopoDS_Shape
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import io
 import math
+import operator
+import sys
 
-def create_professional_tank():
-    """Create a professional tank model for STEP export"""
-    
-    # Tank specifications (SANS 10131:2004 compliant)
-    tank_diameter = 1870.0  # mm
-    tank_length = 3680.0    # mm
-    shell_thickness = 6.0   # mm
-    
-    print("Creating professional tank geometry...")
-    
-    # Create main tank assembly  
-    with BuildPart() as tank_assembly:
-        
-        # 1. Main cylindrical shell
-        print("  ✓ Adding main shell...")
-        Cylinder(radius=tank_diameter/2, height=tank_length)
-        
-        # Create hollow interior
-        with Locations((0, 0, 0)):
-            Cylinder(
-                radius=(tank_diameter/2) - shell_thickness,
-                height=tank_length + 1,
-                mode=Mode.SUBTRACT
-            )
-        
-        # 2. Manhole assembly on top (simplified but professional)
-        print("  ✓ Adding manhole...")
+# Select the STEP export method this build123d release provides, once per process.
+# Only exporters that write straight to disk are used; serialising the model to
+# an in-memory string first would hold the whole STEP file in RAM.
+try:
+    from build123d import export_step as _export_step
+    _EXPORT_KIND = 'function'
+except ImportError:
+    _export_step = None
+    _EXPORT_KIND = 'method' if hasattr(Part, 'export_step') else None
+
+def tube(outer_radius, inner_radius, height):
+    """Hollow cylinder centred on the origin, extruded from an annulus"""
+    with BuildPart() as hollow:
+        with BuildSketch(Plane.XY.offset(-height/2)):
+            Circle(outer_radius)
+            Circle(inner_radius, mode=Mode.SUBTRACT)
+        extrude(amount=height)
+    return hollow.part
+
+# Tank specifications (SANS 10131:2004 compliant)
+TANK_DIAMETER = 1870.0  # mm
+TANK_LENGTH = 3680.0    # mm
+SHELL_THICKNESS = 6.0   # mm
+
+@functools.lru_cache(maxsize=32)
+def _build_shell(tank_diameter, tank_length, shell_thickness):
+    """Main cylindrical shell"""
+    with BuildPart() as shell:
+        add(tube(tank_diameter/2, tank_diameter/2 - shell_thickness, tank_length))
+    return shell.part
+
+@functools.lru_cache(maxsize=32)
+def _build_manhole(tank_diameter):
+    """Manhole assembly on top (simplified but professional)"""
+    with BuildPart() as manhole:
         with Locations((0, 0, tank_diameter/2)):
             # Manhole neck
-            Cylinder(radius=300, height=100)
-            with Locations((0, 0, 0)):
-                Cylinder(radius=295, height=105, mode=Mode.SUBTRACT)
+            add(tube(300, 295, 100))
             
             # Manhole flange  
             with Locations((0, 0, 100)):
-                Cylinder(radius=375, height=20)
-                with Locations((0, 0, 0)):
-                    Cylinder(radius=300, height=25, mode=Mode.SUBTRACT)
-        
-        # 3. Support saddles
-        print("  ✓ Adding support saddles...")
+                add(tube(375, 300, 20))
+    return manhole.part
+
+@functools.lru_cache(maxsize=32)
+def _build_saddles(tank_diameter):
+    """Pair of support saddles"""
+    with BuildPart() as saddles:
         saddle_positions = [1070, -1070]
         for pos in saddle_positions:
             with Locations((pos, 0, -tank_diameter/2)):
                 Box(250, 250, 100, align=(Align.CENTER, Align.CENTER, Align.MIN))
-        
-        # 4. Main nozzles
-        print("  ✓ Adding nozzles...")
-        
+    return saddles.part
+
+@functools.lru_cache(maxsize=32)
+def _build_nozzles(tank_diameter, tank_length):
+    """Fill and vent nozzles on top of the tank"""
+    with BuildPart() as nozzles:
         # Fill nozzle (top)
         with Locations((tank_length/2 - 400, 0, tank_diameter/2)):
-            Cylinder(radius=40, height=150)
-            with Locations((0, 0, 0)):
-                Cylinder(radius=35, height=155, mode=Mode.SUBTRACT)
+            add(tube(40, 35, 150))
         
         # Vent nozzle (top)
         with Locations((tank_length/2 - 800, 0, tank_diameter/2)):
-            Cylinder(radius=25, height=150)
-            with Locations((0, 0, 0)):
-                Cylinder(radius=22, height=155, mode=Mode.SUBTRACT)
-        
-        # 5. Lifting lugs
-        print("  ✓ Adding lifting lugs...")
+            add(tube(25, 22, 150))
+    return nozzles.part
+
+@functools.lru_cache(maxsize=32)
+def _build_lugs(tank_diameter, tank_length):
+    """Pair of lifting lugs"""
+    with BuildPart() as lugs:
         lug_positions = [tank_length * 0.33, -tank_length * 0.33]
         for pos in lug_positions:
             with Locations((pos, tank_diameter/2, 0)):
@@ -85,42 +101,91 @@ def create_professional_tank():
                 with Locations((0, -6, 60)):
                     Cylinder(radius=25, height=15, 
                            rotation=(90, 0, 0), mode=Mode.SUBTRACT)
+    return lugs.part
+
+def _build_brep(build, args):
+    """Worker entry point: build a sub-assembly and return it as BREP bytes
+    
+    build123d Parts do not pickle (they carry an OCCT BRepTools_History), so
+    only the serialised shape crosses the process boundary.
+    """
+    stream = io.BytesIO()
+    BRepTools.Write_s(build(*args).wrapped, stream)
+    return stream.getvalue()
+
+def _part_from_brep(data):
+    shape = TopoDS_Shape()
+    BRepTools.Read_s(shape, io.BytesIO(data), BRep_Builder())
+    return Part(shape)
+
+def create_professional_tank(parallel=False):
+    """Create a professional tank model for STEP export
+    
+    The sub-assemblies are independent and fused into one part at the end.
+    The builders are memoised on their dimensions, so repeated in-process
+    builds reuse the sub-parts made the first time. parallel=True builds
+    them in worker processes instead, which only pays off when the
+    sub-assemblies are heavy enough to outweigh each worker importing
+    build123d and round-tripping its result through BREP.
+    """
+    
+    builders = [
+        ("main shell", _build_shell, (TANK_DIAMETER, TANK_LENGTH, SHELL_THICKNESS)),
+        ("manhole", _build_manhole, (TANK_DIAMETER,)),
+        ("support saddles", _build_saddles, (TANK_DIAMETER,)),
+        ("nozzles", _build_nozzles, (TANK_DIAMETER, TANK_LENGTH)),
+        ("lifting lugs", _build_lugs, (TANK_DIAMETER, TANK_LENGTH)),
+    ]
+    
+    log = ["Creating professional tank geometry..."]
+    
+    if parallel:
+        with ProcessPoolExecutor(max_workers=len(builders)) as pool:
+            futures = [pool.submit(_build_brep, build, args) for _, build, args in builders]
+            parts = [_part_from_brep(future.result()) for future in futures]
+    else:
+        parts = [build(*args) for _, build, args in builders]
+    
+    log.extend(f"  ✓ Added {name}" for name, _, _ in builders)
     
-    print("✅ Tank geometry creation complete!")
-    return tank_assembly.part
+    tank = functools.reduce(operator.add, parts)
+    
+    log.append("✅ Tank geometry creation complete!")
+    sys.stdout.write('\n'.join(log) + '\n')
+    return tank
 
 def export_step_file(part_object, filename):
-    """Export part to STEP file using correct method"""
+    """Export part to STEP file using the exporter detected at import"""
+    if _EXPORT_KIND is None:
+        raise RuntimeError(
+            "this build123d release provides no streaming STEP exporter; "
+            "upgrade build123d to one with export_step()"
+        )
     try:
-        # Use the exporter
-        from build123d import export_step
-        export_step(part_object, filename)
-        return True
-    except:
-        try:
-            # Alternative method
+        if _EXPORT_KIND == 'function':
+            # build123d's exporter reports failure by returning False
+            return _export_step(part_object, filename) is not False
+        else:
             part_object.export_step(filename)
-            return True
-        except:
-            try:
-                # Try direct file write
-                with open(filename, 'w') as f:
-                    step_data = part_object.to_step()
-                    f.write(step_data)
-                return True
-            except Exception as e:
-                print(f"Export failed: {e}")
-                return False
+        return True
+    except (AttributeError, OSError, RuntimeError, ValueError) as e:
+        print(f"Export failed: {e}")
+        return False
 
 def main():
     """Generate and export the professional tank STEP file"""
     
-    print("=" * 70)
-    print("🏭 SOLPROV ENGINEERING - PROFESSIONAL TANK STEP GENERATOR")
-    print("=" * 70)
-    print("📋 SANS 10131:2004 Compliant | API 650 Based Design")
-    print("🏆 ISO 9001 Certified | SAIME & SAQI Professional Standards")
-    print("=" * 70)
+    log = [
+        "=" * 70,
+        "🏭 SOLPROV ENGINEERING - PROFESSIONAL TANK STEP GENERATOR",
+        "=" * 70,
+        "📋 SANS 10131:2004 Compliant | API 650 Based Design",
+        "🏆 ISO 9001 Certified | SAIME & SAQI Professional Standards",
+        "=" * 70,
+    ]
+    # Show the banner before the (slow) geometry build starts
+    sys.stdout.write('\n'.join(log) + '\n')
+    log.clear()
     
     try:
         # Create the tank model
@@ -128,55 +193,61 @@ def main():
         
         # Export to STEP file
         output_filename = "Professional_SANS_10131_Tank.stp"
-        print(f"\n💾 Exporting to {output_filename}...")
+        log.append(f"\n💾 Exporting to {output_filename}...")
         
         # Try export
         export_success = export_step_file(tank_model, output_filename)
         
         if export_success:
-            print("\n" + "=" * 70)
-            print("🎉 SUCCESS! Professional STEP file generated")
-            print("=" * 70)
-            print(f"📁 Output File: {output_filename}")
-            print("📋 Standards Compliance:")
-            print("   ✅ SANS 10131:2004 - Above-ground storage tanks")
-            print("   ✅ API 650 - Welded steel tanks for oil storage")
-            print("   ✅ ISO 9001 - Quality management systems")
-            print("\n🏭 Tank Specifications:")
-            print("   🔹 Capacity: 9,000L (9 m³)")
-            print("   🔹 Diameter: 1,870 mm")
-            print("   🔹 Length: 3,680 mm")
-            print("   🔹 Shell Thickness: 6 mm")
-            print("   🔹 Material: Carbon Steel Grade 300WA (SANS 1431)")
-            print("   🔹 Design Pressure: 2.5 psig")
-            print("   🔹 Design Temperature: 60°C")
-            print("\n🔧 Components Included:")
-            print("   ✓ Cylindrical shell with calculated thickness")
-            print("   ✓ Manhole with flange (600mm)")
-            print("   ✓ Support saddles with proper positioning")
-            print("   ✓ Fill and vent nozzles")
-            print("   ✓ Lifting lugs for safe handling")
-            print("\n🎯 Ready for:")
-            print("   📐 SolidWorks import and detailed design")
-            print("   👷 Professional engineering review")
-            print("   🏗️ Manufacturing and fabrication")
-            print("   📋 Compliance verification")
-            print("\n" + "=" * 70)
-            print("🏢 Solprov Engineering (Pty) Ltd")
-            print("   Professional Engineering Solutions")
-            print("   14+ Years Experience | ISO 9001 Certified")
-            print("   SAIME & SAQI Members")
-            print("=" * 70)
+            log.extend([
+                "\n" + "=" * 70,
+                "🎉 SUCCESS! Professional STEP file generated",
+                "=" * 70,
+                f"📁 Output File: {output_filename}",
+                "📋 Standards Compliance:",
+                "   ✅ SANS 10131:2004 - Above-ground storage tanks",
+                "   ✅ API 650 - Welded steel tanks for oil storage",
+                "   ✅ ISO 9001 - Quality management systems",
+                "\n🏭 Tank Specifications:",
+                "   🔹 Capacity: 9,000L (9 m³)",
+                "   🔹 Diameter: 1,870 mm",
+                "   🔹 Length: 3,680 mm",
+                "   🔹 Shell Thickness: 6 mm",
+                "   🔹 Material: Carbon Steel Grade 300WA (SANS 1431)",
+                "   🔹 Design Pressure: 2.5 psig",
+                "   🔹 Design Temperature: 60°C",
+                "\n🔧 Components Included:",
+                "   ✓ Cylindrical shell with calculated thickness",
+                "   ✓ Manhole with flange (600mm)",
+                "   ✓ Support saddles with proper positioning",
+                "   ✓ Fill and vent nozzles",
+                "   ✓ Lifting lugs for safe handling",
+                "\n🎯 Ready for:",
+                "   📐 SolidWorks import and detailed design",
+                "   👷 Professional engineering review",
+                "   🏗️ Manufacturing and fabrication",
+                "   📋 Compliance verification",
+                "\n" + "=" * 70,
+                "🏢 Solprov Engineering (Pty) Ltd",
+                "   Professional Engineering Solutions",
+                "   14+ Years Experience | ISO 9001 Certified",
+                "   SAIME & SAQI Members",
+                "=" * 70,
+            ])
+            sys.stdout.write('\n'.join(log) + '\n')
             return True
         else:
             raise Exception("STEP export failed with all methods")
         
     except Exception as e:
-        print(f"\n❌ Error: {str(e)}")
-        print("💡 Alternative: Comprehensive documentation available")
-        print("   📋 Tank_Design_Analysis_Report.md")
-        print("   ✅ Tank_Safety_Compliance_Checklist.md")
-        print("   🔧 professional_tank_design_system.py")
+        log.extend([
+            f"\n❌ Error: {str(e)}",
+            "💡 Alternative: Comprehensive documentation available",
+            "   📋 Tank_Design_Analysis_Report.md",
+            "   ✅ Tank_Safety_Compliance_Checklist.md",
+            "   🔧 professional_tank_design_system.py",
+        ])
+        sys.stdout.write('\n'.join(log) + '\n')
         return False
 
 if __name__ == "__main__":
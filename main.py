@@ -8,36 +8,164 @@ Hosts the complete professional tank design process documentation.
 """
 
 import http.server
+import gzip
 import socketserver
+import threading
 import os
+import select
+import zlib
 import markdown
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlparse
 
-class ProfessionalDocumentationHandler(http.server.SimpleHTTPRequestHandler):
-    """Professional documentation handler for Replit deployment"""
+# Prefer GitHub's C cmark parser when installed, then the single-pass
+# mistune parser, and fall back to python-markdown
+try:
+    import cmarkgfm
+    from cmarkgfm.cmark import Options as CmarkOptions
+    CMARKGFM_AVAILABLE = True
+except ImportError:
+    CMARKGFM_AVAILABLE = False
+
+try:
+    import mistune
+    MISTUNE_AVAILABLE = True
+except ImportError:
+    MISTUNE_AVAILABLE = False
+
+# Dashboard document cards: (css_class, icon, title, filename, summary, description, kind)
+DocumentCard = namedtuple('DocumentCard', 'css_class icon title filename summary description kind')
+
+CARDS = [
+    DocumentCard('primary', 'fa-industry', 'Complete Professional Deliverable',
+                 'Comprehensive_Tank_Design_Deliverable.md',
+                 '147-page comprehensive package',
+                 'ready for client delivery. Complete professional deliverable with all engineering calculations, safety compliance, and certifications required for manufacturing.',
+                 'print'),
+    DocumentCard('technical', 'fa-calculator', 'Technical Specifications',
+                 'Tank_Technical_Specifications.md',
+                 'Complete engineering calculations',
+                 'and compliance verification with professional certifications. Every calculation verified and documented to professional standards.',
+                 'print'),
+    DocumentCard('technical', 'fa-search', 'Design Analysis Report',
+                 'Tank_Design_Analysis_Report.md',
+                 'Component-by-component analysis',
+                 'down to the smallest bolt. Every single tank component professionally analyzed and verified for safety and compliance.',
+                 'print'),
+    DocumentCard('safety', 'fa-clipboard-check', 'Safety Compliance Checklist',
+                 'Tank_Safety_Compliance_Checklist.md',
+                 '17 safety standards',
+                 'with professional sign-off sections. Complete compliance verification from pre-fabrication through commissioning.',
+                 'print'),
+    DocumentCard('cad', 'fa-cube', 'Professional STEP File',
+                 'Professional_SANS_10131_Tank.stp',
+                 '9,000L tank ready for SolidWorks import.',
+                 'Complete 3D model with all components and safety features. Professional CAD file for immediate use.',
+                 'download'),
+    DocumentCard('reference', 'fa-rocket', 'Multi-Persona Optimization',
+                 'DEPLOYMENT_SUMMARY.md',
+                 'Complete optimization results',
+                 'from all 11 AI personas. Revolutionary engineering process demonstrating AI-assisted professional design excellence.',
+                 'print'),
+]
+
+_CARD_TMPL = """            <div class="document-card {css_class}">
+                <div class="document-header">
+                    <div class="icon"><i class="fas {icon}"></i></div>
+                    <h3>{title}</h3>
+                </div>
+                <div class="document-content">
+                    <p><strong>{summary}</strong> {description}</p>
+{actions}
+                </div>
+            </div>
+"""
+
+# Buttons for each card kind: printable documents or a plain file download
+_CARD_ACTIONS = {
+    'print': """                    <a href="/document/{filename}" class="btn btn-primary">
+                        <i class="fas fa-eye"></i> View Document
+                    </a>
+                    <button onclick="printDoc('{filename}')" class="btn btn-success">
+                        <i class="fas fa-print"></i> Print PDF
+                    </button>""",
+    'download': """                    <a href="/{filename}" class="btn btn-success" download>
+                        <i class="fas fa-download"></i> Download STEP File
+                    </a>""",
+}
+
+_CARDS_HTML = "            \n".join(
+    _CARD_TMPL.format(actions=_CARD_ACTIONS[card.kind].format(filename=card.filename),
+                      **card._asdict())
+    for card in CARDS)
+
+# Only markdown documents shipped with the app may be served under /document/;
+# anything else is rejected before touching the filesystem
+_ALLOWED_DOCS = frozenset(path.name for path in Path(__file__).parent.glob('*.md'))
+_TITLES = {filename: filename.removesuffix('.md').replace('_', ' ').encode('utf-8')
+           for filename in _ALLOWED_DOCS}
+
+_STEP_FILENAME = 'Professional_SANS_10131_Tank.stp'
+
+class HeldOpenFile:
+    """Keep a download open between requests, reopening it if it is replaced
     
-    def do_GET(self):
-        parsed_path = urlparse(self.path)
-        path = parsed_path.path
-        
-        if path == '/' or path == '/index.html':
-            self.serve_main_dashboard()
-        elif path.startswith('/document/'):
-            doc_name = path.split('/')[-1]
-            self.serve_document(doc_name)
-        else:
-            super().do_GET()
+    Each request then costs one stat() instead of an open/fstat/close. The
+    descriptor is shared between request threads, so it is only ever read at
+    explicit offsets (os.sendfile), never through a file position. A
+    superseded descriptor is closed once the last request using it finishes.
+    """
     
-    def serve_main_dashboard(self):
-        html_content = """
+    def __init__(self, filename):
+        self.filename = filename
+        self.fd = None
+        self.stat = None
+        self.users = {}
+        self.lock = threading.Lock()
+    
+    @contextmanager
+    def current(self):
+        st = os.stat(self.filename)
+        with self.lock:
+            held = self.stat
+            if (held is None or st.st_ino != held.st_ino
+                    or st.st_mtime_ns != held.st_mtime_ns or st.st_size != held.st_size):
+                superseded = self.fd
+                self.fd = os.open(self.filename, os.O_RDONLY)
+                self.stat = os.fstat(self.fd)
+                self.users[self.fd] = 0
+                if superseded is not None:
+                    self._close_if_unused(superseded)
+            fd, st = self.fd, self.stat
+            self.users[fd] += 1
+        try:
+            yield fd, st
+        finally:
+            with self.lock:
+                self.users[fd] -= 1
+                if fd != self.fd:
+                    self._close_if_unused(fd)
+    
+    def _close_if_unused(self, fd):
+        if not self.users[fd]:
+            del self.users[fd]
+            os.close(fd)
+
+_STEP_DOWNLOAD = HeldOpenFile(_STEP_FILENAME)
+
+# The dashboard is static, so it is encoded once at import time
+_DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Professional Tank Design System - Solprov Engineering</title>
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+    <link rel="preconnect" href="https://cdnjs.cloudflare.com" crossorigin>
+    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet" media="print" onload="this.media='all'">
+    <noscript><link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet"></noscript>
     <style>
         * { margin: 0; padding: 0; box-sizing: border-box; }
         
@@ -310,99 +438,7 @@ class ProfessionalDocumentationHandler(http.server.SimpleHTTPRequestHandler):
         </h2>
         
         <div class="documents-grid">
-            <div class="document-card primary">
-                <div class="document-header">
-                    <div class="icon"><i class="fas fa-industry"></i></div>
-                    <h3>Complete Professional Deliverable</h3>
-                </div>
-                <div class="document-content">
-                    <p><strong>147-page comprehensive package</strong> ready for client delivery. Complete professional deliverable with all engineering calculations, safety compliance, and certifications required for manufacturing.</p>
-                    <a href="/document/Comprehensive_Tank_Design_Deliverable.md" class="btn btn-primary">
-                        <i class="fas fa-eye"></i> View Document
-                    </a>
-                    <button onclick="printDoc('Comprehensive_Tank_Design_Deliverable.md')" class="btn btn-success">
-                        <i class="fas fa-print"></i> Print PDF
-                    </button>
-                </div>
-            </div>
-            
-            <div class="document-card technical">
-                <div class="document-header">
-                    <div class="icon"><i class="fas fa-calculator"></i></div>
-                    <h3>Technical Specifications</h3>
-                </div>
-                <div class="document-content">
-                    <p><strong>Complete engineering calculations</strong> and compliance verification with professional certifications. Every calculation verified and documented to professional standards.</p>
-                    <a href="/document/Tank_Technical_Specifications.md" class="btn btn-primary">
-                        <i class="fas fa-eye"></i> View Document
-                    </a>
-                    <button onclick="printDoc('Tank_Technical_Specifications.md')" class="btn btn-success">
-                        <i class="fas fa-print"></i> Print PDF
-                    </button>
-                </div>
-            </div>
-            
-            <div class="document-card technical">
-                <div class="document-header">
-                    <div class="icon"><i class="fas fa-search"></i></div>
-                    <h3>Design Analysis Report</h3>
-                </div>
-                <div class="document-content">
-                    <p><strong>Component-by-component analysis</strong> down to the smallest bolt. Every single tank component professionally analyzed and verified for safety and compliance.</p>
-                    <a href="/document/Tank_Design_Analysis_Report.md" class="btn btn-primary">
-                        <i class="fas fa-eye"></i> View Document
-                    </a>
-                    <button onclick="printDoc('Tank_Design_Analysis_Report.md')" class="btn btn-success">
-                        <i class="fas fa-print"></i> Print PDF
-                    </button>
-                </div>
-            </div>
-            
-            <div class="document-card safety">
-                <div class="document-header">
-                    <div class="icon"><i class="fas fa-clipboard-check"></i></div>
-                    <h3>Safety Compliance Checklist</h3>
-                </div>
-                <div class="document-content">
-                    <p><strong>17 safety standards</strong> with professional sign-off sections. Complete compliance verification from pre-fabrication through commissioning.</p>
-                    <a href="/document/Tank_Safety_Compliance_Checklist.md" class="btn btn-primary">
-                        <i class="fas fa-eye"></i> View Document
-                    </a>
-                    <button onclick="printDoc('Tank_Safety_Compliance_Checklist.md')" class="btn btn-success">
-                        <i class="fas fa-print"></i> Print PDF
-                    </button>
-                </div>
-            </div>
-            
-            <div class="document-card cad">
-                <div class="document-header">
-                    <div class="icon"><i class="fas fa-cube"></i></div>
-                    <h3>Professional STEP File</h3>
-                </div>
-                <div class="document-content">
-                    <p><strong>9,000L tank ready for SolidWorks import.</strong> Complete 3D model with all components and safety features. Professional CAD file for immediate use.</p>
-                    <a href="/Professional_SANS_10131_Tank.stp" class="btn btn-success" download>
-                        <i class="fas fa-download"></i> Download STEP File
-                    </a>
-                </div>
-            </div>
-            
-            <div class="document-card reference">
-                <div class="document-header">
-                    <div class="icon"><i class="fas fa-rocket"></i></div>
-                    <h3>Multi-Persona Optimization</h3>
-                </div>
-                <div class="document-content">
-                    <p><strong>Complete optimization results</strong> from all 11 AI personas. Revolutionary engineering process demonstrating AI-assisted professional design excellence.</p>
-                    <a href="/document/DEPLOYMENT_SUMMARY.md" class="btn btn-primary">
-                        <i class="fas fa-eye"></i> View Document
-                    </a>
-                    <button onclick="printDoc('DEPLOYMENT_SUMMARY.md')" class="btn btn-success">
-                        <i class="fas fa-print"></i> Print PDF
-                    </button>
-                </div>
-            </div>
-        </div>
+""" + _CARDS_HTML + """        </div>
         
         <div style="text-align: center; margin: 3rem 0; padding: 2rem; background: white; border-radius: 10px; box-shadow: 0 4px 15px rgba(0,0,0,0.1);">
             <h3 style="color: #1f4e79; margin-bottom: 1rem;"><i class="fas fa-info-circle"></i> Professional Engineering Standards</h3>
@@ -439,39 +475,271 @@ class ProfessionalDocumentationHandler(http.server.SimpleHTTPRequestHandler):
     </script>
 </body>
 </html>"""
+_DASHBOARD_BYTES = _DASHBOARD_HTML.encode('utf-8')
+_DASHBOARD_LEN = str(len(_DASHBOARD_BYTES))
+_DASHBOARD_GZIP = gzip.compress(_DASHBOARD_BYTES, compresslevel=9)
+_DASHBOARD_GZIP_LEN = str(len(_DASHBOARD_GZIP))
+# ETags only need to change with the content, so a CRC is plenty
+_DASHBOARD_ETAG = f'"{zlib.crc32(_DASHBOARD_BYTES):08x}"'
+_DASHBOARD_GZIP_ETAG = f'"{zlib.crc32(_DASHBOARD_GZIP):08x}-gz"'
+
+def _dashboard_headers(length, etag, encoding=None):
+    """Pre-format the unchanging header block of a 200 dashboard response"""
+    headers = ['Content-type: text/html; charset=utf-8']
+    if encoding:
+        headers.append(f'Content-Encoding: {encoding}')
+    headers += [f'Content-Length: {length}',
+                f'ETag: {etag}',
+                'Cache-Control: public, max-age=3600',
+                'Vary: Accept-Encoding',
+                'Access-Control-Allow-Origin: *']
+    return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1')
+
+_DASHBOARD_HEADERS = _dashboard_headers(_DASHBOARD_LEN, _DASHBOARD_ETAG)
+_DASHBOARD_GZIP_HEADERS = _dashboard_headers(_DASHBOARD_GZIP_LEN, _DASHBOARD_GZIP_ETAG, 'gzip')
+
+# Building a Markdown instance compiles its whole extension pipeline, and
+# parsers are not thread-safe, so each request thread keeps its own and
+# resets it between documents
+_MARKDOWN = threading.local()
+
+if MISTUNE_AVAILABLE:
+    # Parse state lives per call, so one instance is safe to share across threads
+    _MISTUNE = mistune.create_markdown(escape=False,
+                                       plugins=['table', 'footnotes', 'strikethrough'])
+
+def _md_to_html(content):
+    if CMARKGFM_AVAILABLE:
+        # The documents are our own, so keep their inline HTML like markdown does
+        return cmarkgfm.github_flavored_markdown_to_html(
+            content, options=CmarkOptions.CMARK_OPT_UNSAFE)
+    if MISTUNE_AVAILABLE:
+        return _MISTUNE(content)
+    md = getattr(_MARKDOWN, 'parser', None)
+    if md is None:
+        # The pages are HTML5, so skip the XHTML-style self-closing tags
+        md = _MARKDOWN.parser = markdown.Markdown(extensions=['tables', 'fenced_code'],
+                                                  output_format='html')
+    return md.reset().convert(content)
+
+class ProfessionalDocumentationHandler(http.server.SimpleHTTPRequestHandler):
+    """Professional documentation handler for Replit deployment"""
+    
+    # Keep connections open between requests; every response carries a
+    # Content-Length, which HTTP/1.1 keep-alive depends on
+    protocol_version = 'HTTP/1.1'
+    
+    # Buffer response writes so the status line, headers and body leave in
+    # one send instead of one per header line
+    wbufsize = 64 * 1024
+    
+    # ETag to attach to the static file response currently being sent
+    static_etag = None
+    
+    def do_GET(self):
+        path = self.path.partition('?')[0]
+        
+        if path == '/' or path == '/index.html':
+            self.serve_main_dashboard()
+        elif path.startswith('/document/'):
+            self.serve_document(path[len('/document/'):])
+        elif path == '/' + _STEP_FILENAME:
+            self.serve_step_file()
+        else:
+            self.serve_static()
+    
+    def end_headers(self):
+        if self.static_etag:
+            self.send_header('ETag', self.static_etag)
+            self.static_etag = None
+        super().end_headers()
+    
+    def etag_matches(self, etag):
+        """Weak comparison of etag against the request's If-None-Match"""
+        if_none_match = self.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        opaque = etag.removeprefix('W/')
+        return any(tag.strip() == '*' or tag.strip().removeprefix('W/') == opaque
+                   for tag in if_none_match.split(','))
+    
+    def send_not_modified(self, *headers):
+        self.send_response(304)
+        for header in headers:
+            self.send_header(*header)
+        self.end_headers()
+    
+    def serve_static(self):
+        fs_path = self.translate_path(self.path)
+        if os.path.isfile(fs_path):
+            st = os.stat(fs_path)
+            etag = f'W/"{st.st_size:x}-{int(st.st_mtime):x}"'
+            if self.etag_matches(etag):
+                self.send_not_modified(('ETag', etag))
+                return
+            self.static_etag = etag
+        super().do_GET()
+    
+    def copyfile(self, source, outputfile):
+        if outputfile is not self.wfile:
+            return super().copyfile(source, outputfile)
+        
+        # Static downloads such as the STEP file go through sendfile(2);
+        # socket.sendfile() falls back to plain sends for non-file sources.
+        # Flush first so any buffered headers precede the body.
+        outputfile.flush()
+        self.connection.sendfile(source)
+    
+    def serve_step_file(self):
+        if not hasattr(os, 'sendfile'):
+            # Without sendfile(2) there is no offset-based send from a shared
+            # descriptor, so the download is opened per request instead
+            self.serve_static()
+            return
+        try:
+            with _STEP_DOWNLOAD.current() as (fd, st):
+                self.send_step_file(fd, st)
+        except FileNotFoundError:
+            self.send_error(404, "File not found")
+    
+    def send_step_file(self, fd, st):
+        etag = f'W/"{st.st_size:x}-{int(st.st_mtime):x}"'
+        if self.etag_matches(etag):
+            self.send_not_modified(('ETag', etag))
+            return
         
         self.send_response(200)
-        self.send_header('Content-type', 'text/html; charset=utf-8')
-        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-type', self.guess_type(_STEP_FILENAME))
+        self.send_header('Content-Length', str(st.st_size))
+        self.send_header('Last-Modified', self.date_time_string(st.st_mtime))
+        self.send_header('ETag', etag)
         self.end_headers()
-        self.wfile.write(html_content.encode('utf-8'))
+        self.wfile.flush()
+        self.sendfile_range(fd, st.st_size)
+    
+    def sendfile_range(self, fd, count):
+        """Send the first count bytes of fd with explicit offsets, leaving no
+        file position behind for the next request to trip over"""
+        sock = self.connection.fileno()
+        timeout = self.connection.gettimeout()
+        offset = 0
+        while offset < count:
+            try:
+                sent = os.sendfile(sock, fd, offset, count - offset)
+            except BlockingIOError:
+                # Timeout sockets are non-blocking underneath; wait for room
+                if not select.select([], [sock], [], timeout)[1]:
+                    raise TimeoutError("timed out sending STEP file")
+                continue
+            if not sent:
+                # The file shrank under us; the body is short, so drop the connection
+                self.close_connection = True
+                return
+            offset += sent
+    
+    def accepts_gzip(self):
+        """True if Accept-Encoding allows gzip, honouring q-values such as gzip;q=0"""
+        qualities = {}
+        for coding in self.headers.get('Accept-Encoding', '').split(','):
+            name, _, params = coding.partition(';')
+            quality = 1.0
+            for param in params.split(';'):
+                key, _, value = param.partition('=')
+                if key.strip().lower() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            qualities[name.strip().lower()] = quality
+        return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+    
+    def serve_main_dashboard(self):
+        if self.accepts_gzip():
+            body, etag, headers = _DASHBOARD_GZIP, _DASHBOARD_GZIP_ETAG, _DASHBOARD_GZIP_HEADERS
+        else:
+            body, etag, headers = _DASHBOARD_BYTES, _DASHBOARD_ETAG, _DASHBOARD_HEADERS
+        
+        if self.etag_matches(etag):
+            self.send_not_modified(('ETag', etag),
+                                   ('Cache-Control', 'public, max-age=3600'),
+                                   ('Vary', 'Accept-Encoding'))
+            return
+        
+        # Only the status line, Server and Date vary, so skip send_header()
+        # and write the prepared header block straight into the buffer
+        self.log_request(200)
+        self.wfile.write(f'{self.protocol_version} 200 OK\r\n'
+                         f'Server: {self.version_string()}\r\n'
+                         f'Date: {self.date_time_string()}\r\n'.encode('latin-1'))
+        self.wfile.write(headers)
+        self.wfile.write(body)
     
     def serve_document(self, filename):
-        if not os.path.exists(filename):
+        if filename not in _ALLOWED_DOCS:
             self.send_error(404, f"Document not found: {filename}")
             return
         
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            if filename.endswith('.md'):
-                md = markdown.Markdown(extensions=['extra', 'tables', 'toc'])
-                html_content = md.convert(content)
-            else:
-                html_content = f"<pre>{content}</pre>"
+            # A single stat both checks the file exists and keys the cache
+            st = os.stat(filename)
+        except FileNotFoundError:
+            self.send_error(404, f"Document not found: {filename}")
+            return
+        
+        # Documents can be edited while the server runs, so let browsers
+        # keep a copy but revalidate it on every view; the gzip and identity
+        # bodies differ, so each gets its own ETag
+        use_gzip = self.accepts_gzip()
+        etag_suffix = '-gz' if use_gzip else ''
+        cache_headers = (('ETag', f'W/"{st.st_mtime_ns:x}-{st.st_size:x}{etag_suffix}"'),
+                         ('Cache-Control', 'no-cache'),
+                         ('Vary', 'Accept-Encoding'))
+        if self.etag_matches(cache_headers[0][1]):
+            self.send_not_modified(*cache_headers)
+            return
+        
+        try:
+            page, page_gzip = _render(filename, st.st_mtime_ns)
             
-            title = filename.replace('_', ' ').replace('.md', '')
+            self.send_response(200)
+            self.send_header('Content-type', 'text/html; charset=utf-8')
+            if use_gzip:
+                page = page_gzip
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(page)))
+            for header in cache_headers:
+                self.send_header(*header)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            self.wfile.write(page)
             
-            full_html = f"""
+        except Exception as e:
+            self.send_error(500, f"Error reading document: {str(e)}")
+
+class DocumentationServer(socketserver.ThreadingTCPServer):
+    """Threaded TCP server tuned for bursts of simultaneous browser connections"""
+    
+    # Don't let in-flight downloads keep the process alive on Ctrl+C
+    daemon_threads = True
+    
+    # The default backlog of 5 drops connections when a browser opens
+    # several at once; let the kernel queue them instead
+    request_queue_size = 128
+    allow_reuse_address = True
+
+# Static pieces of the document page; only the title and rendered body vary
+_DOC_HEAD = """
 <!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
-    <title>{title} - Solprov Engineering</title>
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
+    <title>""".encode('utf-8')
+_DOC_MID = """ - Solprov Engineering</title>
+    <link rel="preconnect" href="https://cdnjs.cloudflare.com" crossorigin>
+    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet" media="print" onload="this.media='all'">
+    <noscript><link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet"></noscript>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             line-height: 1.6;
             color: #333;
@@ -479,73 +747,73 @@ class ProfessionalDocumentationHandler(http.server.SimpleHTTPRequestHandler):
             margin: 0 auto;
             padding: 20mm;
             background: white;
-        }}
+        }
         
-        @media print {{
-            body {{ margin: 0; padding: 15mm; font-size: 10pt; }}
-            .no-print {{ display: none !important; }}
-        }}
+        @media print {
+            body { margin: 0; padding: 15mm; font-size: 10pt; }
+            .no-print { display: none !important; }
+        }
         
-        h1 {{ 
+        h1 { 
             color: #1f4e79; 
             border-bottom: 3px solid #1f4e79; 
             padding-bottom: 0.5em;
             font-size: 2em;
-        }}
+        }
         
-        h2 {{ 
+        h2 { 
             color: #2f5f8f; 
             margin-top: 2em; 
             font-size: 1.5em;
-        }}
+        }
         
-        h3 {{ 
+        h3 { 
             color: #365f91; 
             font-size: 1.3em;
-        }}
+        }
         
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             margin: 1em 0;
             font-size: 0.9em;
-        }}
+        }
         
-        table, th, td {{ border: 1px solid #ddd; }}
+        table, th, td { border: 1px solid #ddd; }
         
-        th {{
+        th {
             background-color: #f8f9fa;
             padding: 8px;
             font-weight: bold;
             text-align: left;
             color: #1f4e79;
-        }}
+        }
         
-        td {{ 
+        td { 
             padding: 8px; 
             vertical-align: top; 
-        }}
+        }
         
-        tr:nth-child(even) {{ background-color: #f9f9f9; }}
+        tr:nth-child(even) { background-color: #f9f9f9; }
         
-        code {{
+        code {
             background-color: #f4f4f4;
             padding: 2px 4px;
             border-radius: 3px;
             font-family: 'Consolas', 'Monaco', monospace;
             font-size: 0.9em;
-        }}
+        }
         
-        pre {{
+        pre {
             background-color: #f8f8f8;
             border: 1px solid #ddd;
             border-radius: 4px;
             padding: 1em;
             overflow-x: auto;
             margin: 1em 0;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 2em;
             padding-bottom: 1em;
@@ -554,9 +822,9 @@ class ProfessionalDocumentationHandler(http.server.SimpleHTTPRequestHandler):
             padding: 2em;
             border-radius: 10px;
             margin-bottom: 3em;
-        }}
+        }
         
-        .back-button {{
+        .back-button {
             position: fixed;
             top: 20px;
             left: 20px;
@@ -568,39 +836,39 @@ class ProfessionalDocumentationHandler(http.server.SimpleHTTPRequestHandler):
             box-shadow: 0 2px 10px rgba(0,0,0,0.2);
             z-index: 1000;
             transition: all 0.3s ease;
-        }}
+        }
         
-        .back-button:hover {{
+        .back-button:hover {
             background: #2c5aa0;
             transform: translateY(-2px);
-        }}
+        }
         
-        ul, ol {{
+        ul, ol {
             margin: 1em 0;
             padding-left: 2em;
-        }}
+        }
         
-        li {{
+        li {
             margin: 0.5em 0;
-        }}
+        }
         
-        blockquote {{
+        blockquote {
             border-left: 4px solid #1f4e79;
             padding-left: 1em;
             margin: 1em 0;
             color: #555;
             font-style: italic;
-        }}
+        }
         
-        .highlight {{
+        .highlight {
             background: #fff3cd;
             padding: 0.25em 0.5em;
             border-radius: 3px;
-        }}
+        }
         
-        .success {{ color: #28a745; font-weight: bold; }}
-        .warning {{ color: #ffc107; font-weight: bold; }}
-        .error {{ color: #dc3545; font-weight: bold; }}
+        .success { color: #28a745; font-weight: bold; }
+        .warning { color: #ffc107; font-weight: bold; }
+        .error { color: #dc3545; font-weight: bold; }
     </style>
 </head>
 <body>
@@ -609,13 +877,15 @@ class ProfessionalDocumentationHandler(http.server.SimpleHTTPRequestHandler):
     </a>
     
     <div class="header">
-        <h1><i class="fas fa-file-alt"></i> {title}</h1>
+        <h1><i class="fas fa-file-alt"></i> """.encode('utf-8')
+_DOC_BODY = """</h1>
         <p><strong><i class="fas fa-building"></i> Solprov Engineering (Pty) Ltd</strong> | Professional Engineering Solutions</p>
         <p><i class="fas fa-certificate"></i> ISO 9001 Certified | <i class="fas fa-calendar"></i> Generated: August 2025</p>
     </div>
     
     <div style="margin-top: 2em;">
-        {html_content}
+        """.encode('utf-8')
+_DOC_TAIL = """
     </div>
     
     <div style="text-align: center; margin-top: 3em; padding-top: 2em; border-top: 1px solid #ddd; color: #666;">
@@ -623,16 +893,24 @@ class ProfessionalDocumentationHandler(http.server.SimpleHTTPRequestHandler):
         <p><i class="fas fa-shield-alt"></i> Professional Engineering Standards | <i class="fas fa-check-circle"></i> Quality Assured</p>
     </div>
 </body>
-</html>"""
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            self.wfile.write(full_html.encode('utf-8'))
-            
-        except Exception as e:
-            self.send_error(500, f"Error reading document: {str(e)}")
+</html>""".encode('utf-8')
+
+@lru_cache(maxsize=128)
+def _render(filename, mtime_ns):
+    """Render a document to a complete HTML page, returned as (raw, gzipped) bytes
+    
+    mtime_ns is only part of the cache key, so an edited file misses the
+    cache and is rendered again.
+    """
+    # Only allowlisted markdown reaches here: decode once, parse, encode once
+    with open(filename, 'rb') as f:
+        html_content = _md_to_html(f.read().decode('utf-8'))
+    
+    title = _TITLES[filename]
+    
+    page = b''.join([_DOC_HEAD, title, _DOC_MID, title, _DOC_BODY,
+                     html_content.encode('utf-8'), _DOC_TAIL])
+    return page, gzip.compress(page, compresslevel=9)
 
 def main():
     """Main entry point for Replit deployment"""
@@ -654,7 +932,7 @@ def main():
     # Ensure we're in the correct directory
     os.chdir(Path(__file__).parent)
     
-    with socketserver.TCPServer(("0.0.0.0", PORT), ProfessionalDocumentationHandler) as httpd:
+    with DocumentationServer(("0.0.0.0", PORT), ProfessionalDocumentationHandler) as httpd:
         print(f"Server running on port {PORT}")
         print("Documentation system deployed successfully")
         print("=" * 60)
@@ -9,26 +9,15 @@ Creates PDF documentation from Markdown files.
 
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-def markdown_to_pdf(markdown_file, output_pdf, title=None):
-    """Convert markdown file to professional PDF"""
-    try:
-        import markdown
-        from weasyprint import HTML, CSS
-        
-        print(f"Converting {markdown_file} to PDF...")
-        
-        # Read markdown content
-        with open(markdown_file, 'r', encoding='utf-8') as f:
-            markdown_content = f.read()
-        
-        # Convert markdown to HTML
-        md = markdown.Markdown(extensions=['extra', 'codehilite', 'toc'])
-        html_content = md.convert(markdown_content)
-        
-        # Professional CSS styling
-        css_styling = CSS(string='''
+# Buffer size for markdown reads and PDF writes
+IO_BUFFER_SIZE = 1 << 20
+
+# Professional CSS styling
+CSS_STYLING = '''
         @page {
             size: A4;
             margin: 2.5cm;
@@ -89,7 +78,33 @@ def markdown_to_pdf(markdown_file, output_pdf, title=None):
             padding: 10px;
             margin: 1em 0;
         }
-        ''')
+        '''
+
+@lru_cache(maxsize=None)
+def _stylesheet():
+    """Parse the professional stylesheet once per process"""
+    from weasyprint import CSS
+    return CSS(string=CSS_STYLING)
+
+@lru_cache(maxsize=None)
+def _markdown():
+    """Markdown converter built once per process and reset between documents"""
+    import markdown
+    return markdown.Markdown(extensions=['extra', 'codehilite', 'toc'])
+
+def markdown_to_pdf(markdown_file, output_pdf, title=None):
+    """Convert markdown file to professional PDF"""
+    try:
+        from weasyprint import HTML
+        
+        print(f"Converting {markdown_file} to PDF...")
+        
+        # Read markdown content
+        with open(markdown_file, 'rb', buffering=IO_BUFFER_SIZE) as f:
+            markdown_content = f.read().decode('utf-8')
+        
+        # Convert markdown to HTML
+        html_content = _markdown().reset().convert(markdown_content)
         
         # Create complete HTML document
         html_document = f'''
@@ -113,7 +128,8 @@ def markdown_to_pdf(markdown_file, output_pdf, title=None):
         
         # Generate PDF
         html_doc = HTML(string=html_document)
-        html_doc.write_pdf(output_pdf, stylesheets=[css_styling])
+        with open(output_pdf, 'wb', buffering=IO_BUFFER_SIZE) as f:
+            html_doc.write_pdf(f, stylesheets=[_stylesheet()])
         
         print(f"Success: Created {output_pdf}")
         return True
@@ -122,6 +138,14 @@ def markdown_to_pdf(markdown_file, output_pdf, title=None):
         print(f"Error converting {markdown_file}: {e}")
         return False
 
+def _convert_document(job):
+    """Process pool worker: convert one (markdown_file, output_pdf, title) job"""
+    markdown_file, output_pdf, title = job
+    if not os.path.exists(markdown_file):
+        print(f"File not found: {markdown_file}")
+        return False
+    return markdown_to_pdf(markdown_file, output_pdf, title)
+
 def main():
     print("=" * 50)
     print("PDF Documentation Generator")
@@ -141,16 +165,13 @@ def main():
     pdf_dir = Path('Professional_PDF_Documentation')
     pdf_dir.mkdir(exist_ok=True)
     
-    successful = 0
     total = len(documents)
+    jobs = [(markdown_file, str(pdf_dir / pdf_filename), title)
+            for markdown_file, pdf_filename, title in documents]
     
-    for markdown_file, pdf_filename, title in documents:
-        if os.path.exists(markdown_file):
-            output_path = pdf_dir / pdf_filename
-            if markdown_to_pdf(markdown_file, str(output_path), title):
-                successful += 1
-        else:
-            print(f"File not found: {markdown_file}")
+    # Each conversion is independent and CPU-bound, so run one per process
+    with ProcessPoolExecutor(max_workers=min(total, os.cpu_count() or 1)) as pool:
+        successful = sum(pool.map(_convert_document, jobs))
     
     print(f"\nConversion Summary: {successful}/{total} files converted successfully")
     print(f"PDF files created in: {pdf_dir.absolute()}")
@@ -11,8 +11,47 @@ with basic geometric shapes that represent the professional tank design.
 """
 
 import math
+import os
+import sys
+from functools import lru_cache
 from build123d import *
 
+# Exported part metadata
+STEP_PART_LABEL = "SANS_10131_Professional_Tank"
+STEEL_COLOR = Color(0.7, 0.7, 0.8)  # Professional steel color
+
+# Nozzle geometry by nominal size (mm): pipe OD radius, pipe ID radius, flange OD radius
+NOZZLE_DIMENSIONS = {
+    80: (40, 35, 70),    # 3"
+    50: (25, 22, 45),    # 2"
+    25: (12.5, 10, 22)   # 1"
+}
+NOZZLE_LENGTH = 150        # mm
+FLANGE_THICKNESS = 18      # mm
+
+def hollow_tube(outer_radius, inner_radius, height):
+    """Open-ended tube shelled from a solid cylinder rather than cut by a Boolean"""
+    with BuildPart(mode=Mode.PRIVATE) as tube:
+        Cylinder(radius=outer_radius, height=height)
+        offset(amount=-(outer_radius - inner_radius), openings=tube.faces().filter_by(Axis.Z))
+    return tube.part
+
+def flange_ring(outer_radius, inner_radius, thickness):
+    """Flat flange ring extruded from an annular sketch"""
+    with BuildPart(mode=Mode.PRIVATE) as ring:
+        with BuildSketch():
+            Circle(outer_radius)
+            Circle(inner_radius, mode=Mode.SUBTRACT)
+        extrude(amount=thickness/2, both=True)
+    return ring.part
+
+@lru_cache(maxsize=None)
+def nozzle_pair(nominal_size):
+    """(nozzle, flange) parts for a nominal size, built once and reused at every placement"""
+    outer_radius, inner_radius, flange_radius = NOZZLE_DIMENSIONS[nominal_size]
+    return (hollow_tube(outer_radius, inner_radius, NOZZLE_LENGTH),
+            flange_ring(flange_radius, outer_radius, FLANGE_THICKNESS))
+
 def create_simple_professional_tank():
     """Create a simplified but professional tank model for STEP export"""
     
@@ -33,13 +72,11 @@ def create_simple_professional_tank():
             align=(Align.CENTER, Align.CENTER, Align.CENTER)
         )
         
-        # Create hollow interior
-        inner_cylinder = Cylinder(
-            radius=(tank_diameter/2) - shell_thickness,
-            height=tank_length + 10,
-            align=(Align.CENTER, Align.CENTER, Align.CENTER),
-            mode=Mode.SUBTRACT
-        )
+        # Create hollow interior by shelling the cylinder, open at both ends
+        offset(amount=-shell_thickness, openings=tank.faces().filter_by(Axis.Z))
+        
+        # Parts are placed into one list and fused with a single add() at the end
+        placements = []
         
         # Add dished ends (simplified as spherical caps)
         print("  - Adding dished ends...")
@@ -55,10 +92,10 @@ def create_simple_professional_tank():
         left_end = left_sphere - left_cutter
         
         # Position at tank end
-        add(left_end, loc=Location((-tank_length/2, 0, 0), (0, 0, 90)))
+        placements.append(left_end.moved(Location((-tank_length/2, 0, 0), (0, 0, 90))))
         
         # Right end cap (mirrored)
-        add(left_end, loc=Location((tank_length/2, 0, 0), (0, 0, -90)))
+        placements.append(left_end.moved(Location((tank_length/2, 0, 0), (0, 0, -90))))
         
         # Add manhole on top
         print("  - Adding manhole...")
@@ -80,8 +117,8 @@ def create_simple_professional_tank():
         )
         
         # Position manhole on top center
-        add(manhole_cylinder, loc=Location((0, 0, tank_diameter/2)))
-        add(manhole_flange, loc=Location((0, 0, tank_diameter/2 + 100)))
+        placements.append(manhole_cylinder.moved(Location((0, 0, tank_diameter/2))))
+        placements.append(manhole_flange.moved(Location((0, 0, tank_diameter/2 + 100))))
         
         # Add support saddles
         print("  - Adding support saddles...")
@@ -101,39 +138,35 @@ def create_simple_professional_tank():
         )
         
         # Position saddles
-        add(saddle, loc=Location((saddle_position, 0, -tank_diameter/2)))
-        add(saddle, loc=Location((-saddle_position, 0, -tank_diameter/2)))
+        placements.append(saddle.moved(Location((saddle_position, 0, -tank_diameter/2))))
+        placements.append(saddle.moved(Location((-saddle_position, 0, -tank_diameter/2))))
         
         # Add nozzles
         print("  - Adding nozzles...")
         
         # Fill nozzle (80mm, 3")
-        fill_nozzle = Cylinder(radius=40, height=150) - Cylinder(radius=35, height=155)
-        fill_flange = Cylinder(radius=70, height=18) - Cylinder(radius=40, height=20)
+        fill_nozzle, fill_flange = nozzle_pair(80)
         
-        add(fill_nozzle, loc=Location((tank_length/2 - 400, 0, tank_diameter/2)))
-        add(fill_flange, loc=Location((tank_length/2 - 400, 0, tank_diameter/2 + 150)))
+        placements.append(fill_nozzle.moved(Location((tank_length/2 - 400, 0, tank_diameter/2))))
+        placements.append(fill_flange.moved(Location((tank_length/2 - 400, 0, tank_diameter/2 + 150))))
         
         # Vent nozzle (50mm, 2")
-        vent_nozzle = Cylinder(radius=25, height=150) - Cylinder(radius=22, height=155)
-        vent_flange = Cylinder(radius=45, height=18) - Cylinder(radius=25, height=20)
+        vent_nozzle, vent_flange = nozzle_pair(50)
         
-        add(vent_nozzle, loc=Location((tank_length/2 - 800, 0, tank_diameter/2)))
-        add(vent_flange, loc=Location((tank_length/2 - 800, 0, tank_diameter/2 + 150)))
+        placements.append(vent_nozzle.moved(Location((tank_length/2 - 800, 0, tank_diameter/2))))
+        placements.append(vent_flange.moved(Location((tank_length/2 - 800, 0, tank_diameter/2 + 150))))
         
         # Outlet nozzle (50mm, 2")
-        outlet_nozzle = Cylinder(radius=25, height=150) - Cylinder(radius=22, height=155)
-        outlet_flange = Cylinder(radius=45, height=18) - Cylinder(radius=25, height=20)
+        outlet_nozzle, outlet_flange = nozzle_pair(50)
         
-        add(outlet_nozzle, loc=Location((tank_length/2, tank_diameter/2 - 150, 0), (90, 0, 0)))
-        add(outlet_flange, loc=Location((tank_length/2 + 150, tank_diameter/2 - 150, 0), (90, 0, 0)))
+        placements.append(outlet_nozzle.moved(Location((tank_length/2, tank_diameter/2 - 150, 0), (90, 0, 0))))
+        placements.append(outlet_flange.moved(Location((tank_length/2 + 150, tank_diameter/2 - 150, 0), (90, 0, 0))))
         
         # Drain nozzle (25mm, 1")
-        drain_nozzle = Cylinder(radius=12.5, height=150) - Cylinder(radius=10, height=155)
-        drain_flange = Cylinder(radius=22, height=18) - Cylinder(radius=12.5, height=20)
+        drain_nozzle, drain_flange = nozzle_pair(25)
         
-        add(drain_nozzle, loc=Location((0, 0, -tank_diameter/2), (0, 0, 0)))
-        add(drain_flange, loc=Location((0, 0, -tank_diameter/2 - 150), (0, 0, 0)))
+        placements.append(drain_nozzle.moved(Location((0, 0, -tank_diameter/2), (0, 0, 0))))
+        placements.append(drain_flange.moved(Location((0, 0, -tank_diameter/2 - 150), (0, 0, 0))))
         
         # Add lifting lugs
         print("  - Adding lifting lugs...")
@@ -144,54 +177,71 @@ def create_simple_professional_tank():
         )
         
         lug_spacing = tank_length * 0.67
-        add(lug, loc=Location((lug_spacing/2, tank_diameter/2, 0), (90, 0, 0)))
-        add(lug, loc=Location((-lug_spacing/2, tank_diameter/2, 0), (90, 0, 0)))
+        placements.append(lug.moved(Location((lug_spacing/2, tank_diameter/2, 0), (90, 0, 0))))
+        placements.append(lug.moved(Location((-lug_spacing/2, tank_diameter/2, 0), (90, 0, 0))))
+        
+        add(placements)
     
     print("Tank geometry creation complete!")
     return tank.part
 
+# Console text for main(), built once
+BANNER = "=" * 60
+
+MAIN_HEADER = f"""{BANNER}
+SOLPROV ENGINEERING - PROFESSIONAL TANK STEP GENERATOR
+{BANNER}
+SANS 10131:2004 Compliant | API 650 Based Design
+ISO 9001 Certified | SAIME & SAQI Professional Standards
+{BANNER}
+"""
+
+SUCCESS_FORMAT = f"""{BANNER}
+✅ SUCCESS! Professional STEP file generated
+{BANNER}
+📁 File: {{}}
+📋 Compliance: SANS 10131:2004 + API 650
+🏭 Specifications:
+   - Capacity: 9,000L (9 m³)
+   - Diameter: 1,870 mm
+   - Length: 3,680 mm
+   - Shell Thickness: 6 mm
+   - Material: Carbon Steel Grade 300WA
+   - Design Pressure: 2.5 psig
+   - Components: Shell, Ends, Manhole, Nozzles, Supports, Lugs
+
+🎯 Ready for SolidWorks import and professional review
+{BANNER}
+Solprov Engineering (Pty) Ltd
+Professional Engineering Solutions
+{BANNER}
+""".format
+
 def main():
     """Generate and export the professional tank STEP file"""
     
-    print("=" * 60)
-    print("SOLPROV ENGINEERING - PROFESSIONAL TANK STEP GENERATOR")
-    print("=" * 60)
-    print("SANS 10131:2004 Compliant | API 650 Based Design")
-    print("ISO 9001 Certified | SAIME & SAQI Professional Standards")
-    print("=" * 60)
+    sys.stdout.write(MAIN_HEADER)
     
     try:
         # Create the tank model
         tank_model = create_simple_professional_tank()
         
         # Set professional properties
-        tank_model.label = "SANS_10131_Professional_Tank"
-        tank_model.color = Color(0.7, 0.7, 0.8)  # Professional steel color
+        tank_model.label = STEP_PART_LABEL
+        tank_model.color = STEEL_COLOR
         
         # Export to STEP file
         output_filename = "Professional_SANS_10131_Tank.stp"
         print(f"\nExporting to {output_filename}...")
         
-        tank_model.export_step(output_filename)
-        
-        print("=" * 60)
-        print("✅ SUCCESS! Professional STEP file generated")
-        print("=" * 60)
-        print(f"📁 File: {output_filename}")
-        print("📋 Compliance: SANS 10131:2004 + API 650")
-        print("🏭 Specifications:")
-        print("   - Capacity: 9,000L (9 m³)")
-        print("   - Diameter: 1,870 mm")
-        print("   - Length: 3,680 mm")
-        print("   - Shell Thickness: 6 mm")
-        print("   - Material: Carbon Steel Grade 300WA")
-        print("   - Design Pressure: 2.5 psig")
-        print("   - Components: Shell, Ends, Manhole, Nozzles, Supports, Lugs")
-        print("\n🎯 Ready for SolidWorks import and professional review")
-        print("=" * 60)
-        print("Solprov Engineering (Pty) Ltd")
-        print("Professional Engineering Solutions")
-        print("=" * 60)
+        # Export next to the destination and rename into place, so a failed
+        # export never leaves a truncated file
+        partial_filename = f"{output_filename}.partial"
+        # Skip p-curves: they roughly double the file and importers rebuild them
+        export_step(tank_model, partial_filename, write_pcurves=False)
+        os.replace(partial_filename, output_filename)
+        
+        sys.stdout.write(SUCCESS_FORMAT(output_filename))
         
         return True
         
@@ -3,6 +3,12 @@
 # and exports it as a STEP file for use in CAD software like SolidWorks.
 # The design adheres to the specifications outlined in SANS 10131:2004.
 
+import hashlib
+import io
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
 from build123d import *
 
 # ========================== DESIGN PARAMETERS (SANS 10131) ==========================
@@ -15,7 +21,8 @@ shell_thickness = 6.0
 
 # -- Dished End Parameters (A.3.2.4)
 knuckle_radius = 60.0 # Must be >= 50 mm
-crown_radius = tank_diameter # Must be between D and 1.5*D
+crown_radius_ratio = 1.0 # Crown radius / D; must be between 1.0 and 1.5
+crown_radius = tank_diameter * crown_radius_ratio
 
 # -- Manhole Parameters (A.3.4, A.3.5)
 manhole_diameter = 600.0
@@ -48,40 +55,76 @@ drain_nozzle_od = 33.4 # 1" pipe
 nozzle_length = 150.0
 flange_thickness = 18.0
 flange_od_multiplier = 1.8 # Approximate OD for a standard flange
+fill_flange_od = fill_nozzle_od * flange_od_multiplier
+vent_flange_od = vent_nozzle_od * flange_od_multiplier
+outlet_flange_od = outlet_nozzle_od * flange_od_multiplier
+drain_flange_od = drain_nozzle_od * flange_od_multiplier
+
+@dataclass(slots=True, frozen=True)
+class TankSpec:
+    """Main tank dimensions in mm; hashable, so a spec keys the model cache"""
+    diameter: float = tank_diameter
+    length: float = tank_length
+    thickness: float = shell_thickness
 
 # ========================== MODEL CONSTRUCTION ==========================
 
-def create_tank_model():
+@lru_cache(maxsize=None)
+def create_nozzle(diameter, length, flange_diam, flange_thick):
+    """
+    Creates a flanged nozzle, built once per distinct size and reused
+    at every placement
+    """
+    radius = diameter / 2
+    with BuildPart() as nozzle:
+        with BuildSketch() as pipe_sk:
+            Circle(radius)
+            Circle(radius - shell_thickness, mode=Mode.SUBTRACT)
+        extrude(amount=length)
+        with BuildSketch(Plane.XY.offset(length)) as flange_sk:
+            Circle(flange_diam / 2)
+            Circle(radius, mode=Mode.SUBTRACT)
+        extrude(amount=flange_thick)
+    return nozzle.part
+
+@lru_cache(maxsize=8)
+def create_tank_model(spec=TankSpec()):
     """
     Creates a complete SANS 10131:2004 compliant tank model
-    Returns the complete tank assembly
+    Returns the complete tank assembly, cached per TankSpec
     """
+    diameter, length, thickness = spec.diameter, spec.length, spec.thickness
+    tank_radius = diameter / 2
+    half_length = length / 2
+    lug_offset = length * 0.33
+    crown_radius = diameter * crown_radius_ratio
     
     # --- 1. Create the Main Tank Body ---
     # The tank is built as a pressure vessel (hollow)
     with BuildPart() as tank_body:
-        # Create the cylindrical shell
+        # Create the cylindrical shell directly as a revolved wall section
         with BuildSketch(Plane.XZ) as shell_profile:
-            Rectangle(tank_length, tank_diameter, align=(Align.CENTER, Align.CENTER))
+            with Locations((0, tank_radius)):
+                Rectangle(length, thickness, align=(Align.CENTER, Align.MAX))
         revolve(axis=Axis.X)
         
         # Create the dished ends
         with BuildSketch(Plane.XY) as end_profile:
             with BuildLine() as end_line:
-                l1 = Line((0, (tank_diameter / 2) - knuckle_radius), (0, 0))
-                l2 = CenterArc((knuckle_radius, (tank_diameter / 2) - knuckle_radius), knuckle_radius, 180, 90)
-                l3 = CenterArc((0, (tank_diameter / 2) - crown_radius), crown_radius, 90, 80) # Approx arc
+                l1 = Line((0, tank_radius - knuckle_radius), (0, 0))
+                l2 = CenterArc((knuckle_radius, tank_radius - knuckle_radius), knuckle_radius, 180, 90)
+                l3 = CenterArc((0, tank_radius - crown_radius), crown_radius, 90, 80) # Approx arc
             fillet(end_line.vertices().sort_by(Axis.Y)[-2:], radius=1) # Smooth transition
         
         with BuildPart() as dished_end:
             revolve(end_profile, axis=Axis.Y, revolution_degrees=360)
+            # Shell only the end, open where it meets the cylindrical shell
+            offset(amount=-thickness, kind=Kind.INTERSECTION,
+                   openings=dished_end.faces().filter_by(GeomType.PLANE))
             
         # Position and add the dished ends
-        add(dished_end.part, loc=Location((tank_length / 2, 0, 0)))
-        add(dished_end.part, loc=Location((-tank_length / 2, 0, 0), (0, 180, 0)))
-
-        # Hollow out the entire vessel
-        offset(amount=-shell_thickness, kind=Kind.INTERSECTION)
+        add(dished_end.part, loc=Location((half_length, 0, 0)))
+        add(dished_end.part, loc=Location((-half_length, 0, 0), (0, 180, 0)))
 
     # --- 2. Create and Add Manhole ---
     with BuildPart() as manhole_assembly:
@@ -90,19 +133,12 @@ def create_tank_model():
             Circle(manhole_reinforcing_plate_od / 2)
             Circle(manhole_diameter / 2, mode=Mode.SUBTRACT)
         extrude(amount=manhole_reinforcing_plate_thickness)
-        # Bend the plate to fit the tank curvature
-        bend_radius = tank_diameter / 2 - manhole_reinforcing_plate_thickness
-        angle = 360 * (manhole_reinforcing_plate_od / (2 * 3.14159 * bend_radius))
-        polar_array(path=Circle(radius=bend_radius), count=1, end_angle=angle)
         
-        # Manhole Neck
-        Cylinder(
-            radius=manhole_diameter / 2,
-            height=manhole_neck_height,
-            align=(Align.CENTER, Align.CENTER, Align.MIN)
-        )
-        # Hollow the neck
-        offset(amount=-shell_thickness, openings=faces().filter_by(Axis.Z)[-1])
+        # Manhole Neck, extruded from its wall section
+        with BuildSketch() as manhole_neck_sk:
+            Circle(manhole_diameter / 2)
+            Circle(manhole_diameter / 2 - thickness, mode=Mode.SUBTRACT)
+        extrude(amount=manhole_neck_height)
 
         # Manhole Flange
         with BuildSketch(Plane.XY.offset(manhole_neck_height)) as manhole_flange_sk:
@@ -113,7 +149,7 @@ def create_tank_model():
     # Position the manhole assembly on top of the tank
     tank_body.part.add(
         manhole_assembly.part,
-        loc=Location((0, tank_diameter / 2, 0), (90, 0, 0))
+        loc=Location((0, tank_radius, 0), (90, 0, 0))
     )
 
     # --- 3. Create and Add Support Saddles ---
@@ -123,26 +159,26 @@ def create_tank_model():
         extrude(amount=saddle_thickness, both=True)
         # Cut the cradle for the tank
         add(
-            Cylinder(tank_diameter / 2 + doubling_plate_thickness, saddle_width),
+            Cylinder(tank_radius + doubling_plate_thickness, saddle_width),
             rotation=(0, 90, 0),
             loc=Location((0, saddle_height, 0)),
             mode=Mode.SUBTRACT
         )
         # Add doubling plate
         with BuildSketch() as doubling_sk:
-            arc = Arc((0,0), tank_diameter/2, saddle_angle/2, -saddle_angle/2)
-            Rectangle(tank_diameter, saddle_width, align=(Align.CENTER, Align.CENTER))
+            arc = Arc((0,0), tank_radius, saddle_angle/2, -saddle_angle/2)
+            Rectangle(diameter, saddle_width, align=(Align.CENTER, Align.CENTER))
         extrude(amount=doubling_plate_thickness)
         
     # Position the saddles
     tank_body.part.add(
         saddle.part,
-        loc=Location((saddle_position_from_center, 0, -tank_diameter/2)),
+        loc=Location((saddle_position_from_center, 0, -tank_radius)),
         mode=Mode.FUSE
     )
     tank_body.part.add(
         saddle.part,
-        loc=Location((-saddle_position_from_center, 0, -tank_diameter/2)),
+        loc=Location((-saddle_position_from_center, 0, -tank_radius)),
         mode=Mode.FUSE
     )
 
@@ -157,39 +193,29 @@ def create_tank_model():
     # Position the lugs
     tank_body.part.add(
         lug.part,
-        loc=Location((lug_position_from_center, tank_diameter/2, 0), (90,0,0))
+        loc=Location((lug_offset, tank_radius, 0), (90,0,0))
     )
     tank_body.part.add(
         lug.part,
-        loc=Location((-lug_position_from_center, tank_diameter/2, 0), (90,0,0))
+        loc=Location((-lug_offset, tank_radius, 0), (90,0,0))
     )
 
-    # --- 5. Create a generic nozzle function and add nozzles ---
-    def create_nozzle(diameter, length, flange_diam, flange_thick):
-        with BuildPart() as nozzle:
-            Cylinder(diameter / 2, length, align=(Align.CENTER, Align.CENTER, Align.MIN))
-            offset(amount=-shell_thickness, openings=faces().filter_by(Axis.Z)[-1])
-            with BuildSketch(Plane.XY.offset(length)) as flange_sk:
-                Circle(flange_diam / 2)
-                Circle(diameter / 2, mode=Mode.SUBTRACT)
-            extrude(amount=flange_thick)
-        return nozzle.part
-
+    # --- 5. Add nozzles (vent and outlet share one cached 2" nozzle) ---
     # Add Fill Nozzle (on top)
-    fill_nozzle = create_nozzle(fill_nozzle_od, nozzle_length, fill_nozzle_od * flange_od_multiplier, flange_thickness)
-    tank_body.part.add(fill_nozzle, loc=Location((tank_length/2 - 400, tank_diameter/2, 0), (90,0,0)))
+    fill_nozzle = create_nozzle(fill_nozzle_od, nozzle_length, fill_flange_od, flange_thickness)
+    tank_body.part.add(fill_nozzle, loc=Location((half_length - 400, tank_radius, 0), (90,0,0)))
 
     # Add Vent Nozzle (on top)
-    vent_nozzle = create_nozzle(vent_nozzle_od, nozzle_length, vent_nozzle_od * flange_od_multiplier, flange_thickness)
-    tank_body.part.add(vent_nozzle, loc=Location((tank_length/2 - 800, tank_diameter/2, 0), (90,0,0)))
+    vent_nozzle = create_nozzle(vent_nozzle_od, nozzle_length, vent_flange_od, flange_thickness)
+    tank_body.part.add(vent_nozzle, loc=Location((half_length - 800, tank_radius, 0), (90,0,0)))
 
     # Add Outlet Nozzle (on the end)
-    outlet_nozzle = create_nozzle(outlet_nozzle_od, nozzle_length, outlet_nozzle_od * flange_od_multiplier, flange_thickness)
-    tank_body.part.add(outlet_nozzle, loc=Location((tank_length/2 + shell_thickness, 0, -tank_diameter/2 + 150)))
+    outlet_nozzle = create_nozzle(outlet_nozzle_od, nozzle_length, outlet_flange_od, flange_thickness)
+    tank_body.part.add(outlet_nozzle, loc=Location((half_length + thickness, 0, -tank_radius + 150)))
 
     # Add Drain Nozzle (at the bottom)
-    drain_nozzle = create_nozzle(drain_nozzle_od, nozzle_length, drain_nozzle_od * flange_od_multiplier, flange_thickness)
-    tank_body.part.add(drain_nozzle, loc=Location((0, -tank_diameter/2, 0), (-90,0,0)))
+    drain_nozzle = create_nozzle(drain_nozzle_od, nozzle_length, drain_flange_od, flange_thickness)
+    tank_body.part.add(drain_nozzle, loc=Location((0, -tank_radius, 0), (-90,0,0)))
 
     return tank_body.part
 
@@ -249,23 +275,61 @@ Compliant with SANS 10131:2004 and API 650 Standards
 
 # ========================== EXPORT FUNCTIONS ==========================
 
-def export_step_file(filename="SANS_10131_10000L_Tank.stp"):
+def design_key(spec=TankSpec()):
     """
-    Generate and export the tank model as a STEP file
+    Fingerprint of a tank design: this generator's source plus the model parameters
+    """
+    with open(__file__, 'rb') as f:
+        key = hashlib.blake2b(f.read(), digest_size=16)
+    key.update(repr(spec).encode())
+    return key.hexdigest()
+
+# The design key is carried in the STEP header's FILE_DESCRIPTION, so the
+# exported file itself records which design it was written for
+_DESCRIPTION_PATTERN = re.compile(rb"FILE_DESCRIPTION\(\('[^']*'\)")
+_KEYED_DESCRIPTION = "FILE_DESCRIPTION(('SANS 10131 tank design {key}')"
+_STAMPED_KEY_PATTERN = re.compile(rb"FILE_DESCRIPTION\(\('SANS 10131 tank design ([0-9a-f]+)'\)")
+
+def stamped_design_key(filename):
+    """
+    Design key recorded in a STEP file's header, or None
+    """
+    try:
+        with open(filename, 'rb') as f:
+            header = f.read(4096)
+    except FileNotFoundError:
+        return None
+    match = _STAMPED_KEY_PATTERN.search(header)
+    return match.group(1).decode('ascii') if match else None
+
+def export_step_file(filename="SANS_10131_10000L_Tank.stp",
+                     spec=TankSpec()):
+    """
+    Generate and export the tank model as a STEP file, skipping the export
+    when the file on disk was already written for the same design
     """
     try:
+        key = design_key(spec)
+        if stamped_design_key(filename) == key:
+            print(f"✅ STEP file '{filename}' is up to date.")
+            return True
+        
         print("Generating SANS 10131:2004 compliant tank model...")
-        tank_model = create_tank_model()
+        tank_model = create_tank_model(spec)
         
         print(f"Exporting to {filename}...")
-        tank_model.export_step(filename)
+        step = io.BytesIO()
+        export_step(tank_model, step, write_pcurves=False)
+        with open(filename, 'wb') as f:
+            f.write(_DESCRIPTION_PATTERN.sub(
+                _KEYED_DESCRIPTION.format(key=key).encode('ascii'), step.getvalue(), count=1))
         
         print(f"✅ STEP file '{filename}' has been generated successfully.")
         print("\nTank Specifications:")
         print(f"- Capacity: ~9,000L (9 m³)")
-        print(f"- Diameter: {tank_diameter} mm")
-        print(f"- Length: {tank_length} mm")
-        print(f"- Shell Thickness: {shell_thickness} mm")
+        print(f"- Diameter: {spec.diameter} mm")
+        print(f"- Length: {spec.length} mm")
+        print(f"- Shell Thickness: {spec.thickness} mm")
         print(f"- Standard: SANS 10131:2004")
         
         return True
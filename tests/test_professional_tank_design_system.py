@@ -0,0 +1,130 @@
+import copy
+import dataclasses
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import professional_tank_design_system  # noqa: E402
+from professional_tank_design_system import (  # noqa: E402
+    ProfessionalTankDesigner,
+    SafetyRequirement,
+    SafetyStandard,
+    TankComponent,
+)
+
+
+@pytest.fixture(scope="module")
+def designer():
+    return ProfessionalTankDesigner(9000)
+
+
+@pytest.fixture
+def component():
+    return TankComponent(
+        name="Test Nozzle",
+        material="Carbon Steel",
+        dimensions={"diameter": 60.3, "length": 150.0},
+        thickness=6.0,
+        standard_reference="SANS 62-1",
+        safety_factor=1.5,
+        quality_requirements=["Flanged connections"],
+        inspection_requirements=["Wall thickness verification"],
+        text_dimensions={"schedule": "40"},
+    )
+
+
+@pytest.fixture
+def requirement():
+    return SafetyRequirement(
+        standard=SafetyStandard.SANS_10131_2004,
+        requirement_id="A.3.1",
+        description="Shell thickness",
+        compliance_status=True,
+        verification_method="Ultrasonic thickness gauge",
+        inspector_required=True,
+    )
+
+
+def test_component_dimensions_are_read_only(component):
+    with pytest.raises(TypeError):
+        component.dimensions["diameter"] = 1.0
+    with pytest.raises(TypeError):
+        component.text_dimensions.update(schedule="80")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        component.thickness = 8.0
+
+
+def test_component_asdict(component):
+    data = dataclasses.asdict(component)
+    assert data["dimensions"] == {"diameter": 60.3, "length": 150.0}
+    assert data["text_dimensions"] == {"schedule": "40"}
+    assert data["quality_requirements"] == ("Flanged connections",)
+
+
+@pytest.mark.parametrize("round_trip", [
+    copy.deepcopy,
+    lambda value: pickle.loads(pickle.dumps(value)),
+], ids=["deepcopy", "pickle"])
+def test_value_objects_round_trip(component, requirement, round_trip):
+    for value in (component, requirement):
+        restored = round_trip(value)
+        assert restored == value
+        assert restored is not value
+    restored = round_trip(component)
+    assert restored.report_block == component.report_block
+    with pytest.raises(TypeError):
+        restored.dimensions["length"] = 0.0
+
+
+def test_requirement_asdict(requirement):
+    data = dataclasses.asdict(requirement)
+    assert data["requirement_id"] == "A.3.1"
+    assert data["markdown_row"] == requirement.markdown_row
+
+
+def test_designer_components_round_trip(designer):
+    for component in designer.components.values():
+        assert pickle.loads(pickle.dumps(component)) == component
+        assert copy.deepcopy(component) == component
+        dataclasses.asdict(component)
+
+
+def test_export_step_removes_partial_on_failure(designer, tmp_path, monkeypatch):
+    def failing_export(part, path, write_pcurves=True):
+        Path(path).write_text("ISO-10303-21;\nHEADER;")
+        raise RuntimeError("export failed")
+
+    monkeypatch.setattr(professional_tank_design_system, "export_step", failing_export)
+    target = tmp_path / "tank.step"
+    with pytest.raises(RuntimeError):
+        designer._export_step(None, str(target))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_export_step_renames_into_place(designer, tmp_path):
+    build123d = pytest.importorskip("build123d")
+    target = tmp_path / "tank.step"
+    designer._export_step(build123d.Box(10, 10, 10), str(target))
+    assert [path.name for path in tmp_path.iterdir()] == ["tank.step"]
+    assert target.read_text().startswith("ISO-10303-21;")
+
+
+def test_step_file_restores_parallel_mode(designer, tmp_path, monkeypatch):
+    pytest.importorskip("build123d")
+    options = professional_tank_design_system.BOPAlgo_Options
+    options.SetParallelMode_s(False)
+    seen = []
+    original_revolve = professional_tank_design_system.revolve
+
+    def recording_revolve(*args, **kwargs):
+        seen.append(options.GetParallelMode_s())
+        return original_revolve(*args, **kwargs)
+
+    monkeypatch.setattr(professional_tank_design_system, "revolve", recording_revolve)
+    designer.create_professional_step_file(str(tmp_path / "tank.step"))
+    assert seen and all(seen)
+    assert options.GetParallelMode_s() is False
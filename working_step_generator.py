@@ -11,6 +11,84 @@ This version uses correct build123d syntax for reliable STEP file generation.
 
 from build123d import *
 import math
+import sys
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def tube(outer_radius, inner_radius, height):
+    """Open tube extruded from an annular sketch, centred on its axis like Cylinder; built once per size"""
+    with BuildPart(mode=Mode.PRIVATE) as tube_part:
+        with BuildSketch(Plane.XY.offset(-height / 2)):
+            Circle(outer_radius)
+            Circle(inner_radius, mode=Mode.SUBTRACT)
+        extrude(amount=height)
+    return tube_part.part
+
+def torispherical_head(radius, crown_radius, knuckle_radius, thickness):
+    """Dished end bulging along +X, revolved from its wall meridian (crown and knuckle arcs)"""
+    # The crown centre sits on the axis behind the head, placed so that the
+    # crown and knuckle arcs meet tangentially
+    crown_center = (-math.sqrt((crown_radius - knuckle_radius)**2 - (radius - knuckle_radius)**2), 0)
+    knuckle_center = (0, radius - knuckle_radius)
+    tangent_angle = math.degrees(math.atan2(knuckle_center[1], -crown_center[0]))
+    
+    with BuildPart(mode=Mode.PRIVATE) as head:
+        with BuildSketch(Plane.XY):
+            with BuildLine():
+                outer_knuckle = CenterArc(knuckle_center, knuckle_radius, 90, tangent_angle - 90)
+                outer_crown = CenterArc(crown_center, crown_radius, tangent_angle, -tangent_angle)
+                inner_crown = CenterArc(crown_center, crown_radius - thickness, 0, tangent_angle)
+                inner_knuckle = CenterArc(knuckle_center, knuckle_radius - thickness,
+                                          tangent_angle, 90 - tangent_angle)
+                Line(outer_crown @ 1, inner_crown @ 0)
+                Line(inner_knuckle @ 1, outer_knuckle @ 0)
+            make_face()
+        revolve(axis=Axis.X)
+    return head.part
+
+def manhole():
+    """600mm manhole neck with its bolted flange, origin at the shell crown"""
+    with BuildPart(mode=Mode.PRIVATE) as manhole_part:
+        # Manhole neck, starting 50mm inside the crown so it seats through the shell
+        with BuildSketch(Plane.XY.offset(-50)):
+            Circle(300)
+            Circle(295, mode=Mode.SUBTRACT)
+        extrude(amount=150)
+        
+        # Manhole flange on top of the neck, sketched with its bore and bolt circle (simplified)
+        with BuildSketch(Plane.XY.offset(100)):
+            Circle(375)
+            Circle(295, mode=Mode.SUBTRACT)
+            with PolarLocations(radius=350, count=8):
+                Circle(12, mode=Mode.SUBTRACT)
+        extrude(amount=20)
+    return manhole_part.part
+
+def saddle(tank_radius):
+    """Saddle base with its cradle cut to the shell, origin at the bottom of the shell"""
+    with BuildPart(mode=Mode.PRIVATE) as saddle_part:
+        # Create saddle base, rising 50mm either side of the shell bottom
+        Box(250, 250, 100)
+        # Create saddle cradle cut
+        with Locations((0, 0, tank_radius)):
+            Cylinder(
+                radius=tank_radius,
+                height=260,
+                rotation=(0, 90, 0),
+                mode=Mode.SUBTRACT
+            )
+    return saddle_part.part
+
+def lifting_lug():
+    """Lifting lug plate standing along +Z from its base"""
+    with BuildPart(mode=Mode.PRIVATE) as lug_part:
+        # Main lug body
+        Box(150, 12, 90, align=(Align.CENTER, Align.CENTER, Align.MIN))
+        # Lifting hole
+        with Locations((0, 0, 60)):
+            Cylinder(radius=25, height=15, 
+                   rotation=(90, 0, 0), mode=Mode.SUBTRACT)
+    return lug_part.part
 
 def create_professional_tank():
     """Create a professional tank model for STEP export"""
@@ -19,148 +97,112 @@ def create_professional_tank():
     tank_diameter = 1870.0  # mm
     tank_length = 3680.0    # mm
     shell_thickness = 6.0   # mm
+    crown_radius = tank_diameter  # Between D and 1.5*D (SANS 10131:2004 A.3.2.4)
+    knuckle_radius = max(60.0, tank_diameter * 0.06)  # min 50mm
+    
+    log = ["Creating professional tank geometry..."]
     
-    print("Creating professional tank geometry...")
+    # Sub-parts are built before any Locations block is open: a builder
+    # entered inside one would be placed there as well as by add()
+    manhole_part = manhole()
+    fill_pipe, fill_flange = tube(40, 35, 150), tube(70, 40, 18)
+    small_pipe, small_flange = tube(25, 22, 150), tube(45, 25, 18)
+    drain_pipe, drain_flange = tube(12.5, 10, 150), tube(22, 12.5, 18)
     
     # Create main tank assembly
     with BuildPart() as tank_assembly:
         
-        # 1. Main cylindrical shell
-        print("  ✓ Adding main shell...")
-        Cylinder(
-            radius=tank_diameter/2, 
-            height=tank_length
-        )
-        
-        # Create hollow interior by removing inner cylinder
-        with Locations((0, 0, 0)):
-            Cylinder(
-                radius=(tank_diameter/2) - shell_thickness,
-                height=tank_length + 1,
-                mode=Mode.SUBTRACT
-            )
+        # 1. Main cylindrical shell, revolved about the tank (X) axis from its wall section
+        log.append("  ✓ Adding main shell...")
+        with BuildSketch(Plane.XZ):
+            with Locations((0, tank_diameter/2 - shell_thickness)):
+                Rectangle(tank_length, shell_thickness, align=(Align.CENTER, Align.MIN))
+        revolve(axis=Axis.X)
         
-        # 2. Dished ends (simplified as torispherical heads)
-        print("  ✓ Adding dished ends...")
-        
-        # Create end caps
-        with BuildPart() as end_part:
-            # Create a sphere and cut to make dished end
-            Sphere(radius=tank_diameter/2)
-            # Cut off the back half
-            with Locations((0, 0, 0)):
-                Box(
-                    tank_diameter, tank_diameter, tank_diameter/2,
-                    align=(Align.CENTER, Align.CENTER, Align.MAX),
-                    mode=Mode.SUBTRACT
-                )
+        # 2. Torispherical dished ends, revolved directly with no Boolean
+        log.append("  ✓ Adding dished ends...")
+        end_part = torispherical_head(tank_diameter/2, crown_radius, knuckle_radius, shell_thickness)
         
         # Position end caps
         with Locations((tank_length/2, 0, 0)):
-            add(end_part.part)
+            add(end_part)
         with Locations((-tank_length/2, 0, 0)):
-            add(end_part.part.moved(Location((0, 0, 0), (0, 180, 0))))
+            add(end_part.moved(Location((0, 0, 0), (0, 180, 0))))
         
         # 3. Manhole assembly on top
-        print("  ✓ Adding manhole...")
+        log.append("  ✓ Adding manhole...")
         
         with Locations((0, 0, tank_diameter/2)):
-            # Manhole neck
-            Cylinder(radius=300, height=100)
-            # Remove interior
-            with Locations((0, 0, 0)):
-                Cylinder(radius=295, height=105, mode=Mode.SUBTRACT)
-            
-            # Manhole flange
-            with Locations((0, 0, 100)):
-                Cylinder(radius=375, height=20)
-                # Bolt circle (simplified)
-                with PolarLocations(radius=350, count=8):
-                    Cylinder(radius=12, height=25, mode=Mode.SUBTRACT)
+            add(manhole_part)
         
         # 4. Support saddles
-        print("  ✓ Adding support saddles...")
+        log.append("  ✓ Adding support saddles...")
         
+        # Build the saddle once and place a copy at each position
+        saddle_part = saddle(tank_diameter/2)
         saddle_positions = [1070, -1070]  # ±1070mm from center
-        for pos in saddle_positions:
-            with Locations((pos, 0, -tank_diameter/2)):
-                # Create saddle base
-                Box(250, 250, 100, align=(Align.CENTER, Align.CENTER, Align.MIN))
-                # Create saddle cradle cut
-                with Locations((0, 0, 50)):
-                    Cylinder(
-                        radius=tank_diameter/2 + 5,
-                        height=260,
-                        rotation=(90, 0, 0),
-                        mode=Mode.SUBTRACT
-                    )
+        with Locations(*[(pos, 0, -tank_diameter/2) for pos in saddle_positions]):
+            add(saddle_part)
         
         # 5. Nozzles with flanges
-        print("  ✓ Adding nozzles...")
+        log.append("  ✓ Adding nozzles...")
         
         # Fill nozzle (3" / 80mm)
         with Locations((tank_length/2 - 400, 0, tank_diameter/2)):
-            Cylinder(radius=40, height=150, rotation=(0, 0, 0))
-            Cylinder(radius=35, height=155, mode=Mode.SUBTRACT)
+            add(fill_pipe)
             # Fill nozzle flange
             with Locations((0, 0, 150)):
-                Cylinder(radius=70, height=18)
-                Cylinder(radius=40, height=20, mode=Mode.SUBTRACT)
+                add(fill_flange)
         
         # Vent nozzle (2" / 50mm)  
         with Locations((tank_length/2 - 800, 0, tank_diameter/2)):
-            Cylinder(radius=25, height=150)
-            Cylinder(radius=22, height=155, mode=Mode.SUBTRACT)
+            add(small_pipe)
             # Vent nozzle flange
             with Locations((0, 0, 150)):
-                Cylinder(radius=45, height=18)
-                Cylinder(radius=25, height=20, mode=Mode.SUBTRACT)
+                add(small_flange)
         
         # Outlet nozzle (2" / 50mm)
         with Locations((tank_length/2, tank_diameter/2 - 150, 0)):
-            Cylinder(radius=25, height=150, rotation=(90, 0, 0))
-            Cylinder(radius=22, height=155, rotation=(90, 0, 0), mode=Mode.SUBTRACT)
+            add(small_pipe, rotation=(90, 0, 0))
             # Outlet flange  
             with Locations((0, -150, 0)):
-                Cylinder(radius=45, height=18, rotation=(90, 0, 0))
-                Cylinder(radius=25, height=20, rotation=(90, 0, 0), mode=Mode.SUBTRACT)
+                add(small_flange, rotation=(90, 0, 0))
         
         # Drain nozzle (1" / 25mm)
         with Locations((0, 0, -tank_diameter/2)):
-            Cylinder(radius=12.5, height=150, rotation=(0, 90, 0))
-            Cylinder(radius=10, height=155, rotation=(0, 90, 0), mode=Mode.SUBTRACT)
+            add(drain_pipe, rotation=(0, 90, 0))
             # Drain flange
             with Locations((0, 0, -150)):
-                Cylinder(radius=22, height=18, rotation=(0, 90, 0))
-                Cylinder(radius=12.5, height=20, rotation=(0, 90, 0), mode=Mode.SUBTRACT)
+                add(drain_flange, rotation=(0, 90, 0))
         
         # 6. Lifting lugs
-        print("  ✓ Adding lifting lugs...")
+        log.append("  ✓ Adding lifting lugs...")
         
+        # Build the lug once; it stands out radially from the side of the shell,
+        # its base seated in the shell wall so the two fuse
+        lug_part = lifting_lug()
         lug_positions = [tank_length * 0.33, -tank_length * 0.33]
-        for pos in lug_positions:
-            with Locations((pos, tank_diameter/2, 0)):
-                # Main lug body
-                Box(150, 12, 90, 
-                    align=(Align.CENTER, Align.CENTER, Align.MIN),
-                    rotation=(90, 0, 0))
-                # Lifting hole
-                with Locations((0, -6, 60)):
-                    Cylinder(radius=25, height=15, 
-                           rotation=(90, 0, 0), mode=Mode.SUBTRACT)
+        with Locations(*[(pos, tank_diameter/2 - shell_thickness, 0) for pos in lug_positions]):
+            add(lug_part, rotation=(-90, 0, 0))
     
-    print("✅ Tank geometry creation complete!")
+    log.append("✅ Tank geometry creation complete!")
+    sys.stdout.write('\n'.join(log) + '\n')
     return tank_assembly.part
 
 def main():
     """Generate and export the professional tank STEP file"""
     
-    print("=" * 70)
-    print("🏭 SOLPROV ENGINEERING - PROFESSIONAL TANK STEP GENERATOR")
-    print("=" * 70)
-    print("📋 SANS 10131:2004 Compliant | API 650 Based Design")
-    print("🏆 ISO 9001 Certified | SAIME & SAQI Professional Standards")
-    print("=" * 70)
+    log = [
+        "=" * 70,
+        "🏭 SOLPROV ENGINEERING - PROFESSIONAL TANK STEP GENERATOR",
+        "=" * 70,
+        "📋 SANS 10131:2004 Compliant | API 650 Based Design",
+        "🏆 ISO 9001 Certified | SAIME & SAQI Professional Standards",
+        "=" * 70,
+    ]
+    # Show the banner before the (slow) geometry build starts
+    sys.stdout.write('\n'.join(log) + '\n')
+    log.clear()
     
     try:
         # Create the tank model
@@ -168,53 +210,55 @@ def main():
         
         # Export to STEP file
         output_filename = "Professional_SANS_10131_Tank.stp"
-        print(f"\n💾 Exporting to {output_filename}...")
-        
-        tank_model.export_step(output_filename)
-        
-        print("\n" + "=" * 70)
-        print("🎉 SUCCESS! Professional STEP file generated")
-        print("=" * 70)
-        print(f"📁 Output File: {output_filename}")
-        print("📋 Standards Compliance:")
-        print("   ✅ SANS 10131:2004 - Above-ground storage tanks")
-        print("   ✅ API 650 - Welded steel tanks for oil storage")
-        print("   ✅ ISO 9001 - Quality management systems")
-        print("\n🏭 Tank Specifications:")
-        print("   🔹 Capacity: 9,000L (9 m³)")
-        print("   🔹 Diameter: 1,870 mm")
-        print("   🔹 Length: 3,680 mm")
-        print("   🔹 Shell Thickness: 6 mm")
-        print("   🔹 Material: Carbon Steel Grade 300WA (SANS 1431)")
-        print("   🔹 Design Pressure: 2.5 psig")
-        print("   🔹 Design Temperature: 60°C")
-        print("\n🔧 Components Included:")
-        print("   ✓ Cylindrical shell with calculated thickness")
-        print("   ✓ Torispherical dished ends")
-        print("   ✓ 600mm manhole with flange")
-        print("   ✓ Support saddles with proper positioning")
-        print("   ✓ Nozzles: Fill (3\"), Vent (2\"), Outlet (2\"), Drain (1\")")
-        print("   ✓ Lifting lugs for safe handling")
-        print("\n🎯 Ready for:")
-        print("   📐 SolidWorks import and detailed design")
-        print("   👷 Professional engineering review")
-        print("   🏗️ Manufacturing and fabrication")
-        print("   📋 Compliance verification")
-        print("\n" + "=" * 70)
-        print("🏢 Solprov Engineering (Pty) Ltd")
-        print("   Professional Engineering Solutions")
-        print("   14+ Years Experience | ISO 9001 Certified")
-        print("   SAIME & SAQI Members")
-        print("=" * 70)
+        log.append(f"\n💾 Exporting to {output_filename}...")
+        
+        export_step(tank_model, output_filename, write_pcurves=False)
+        
+        log.append("\n" + "=" * 70)
+        log.append("🎉 SUCCESS! Professional STEP file generated")
+        log.append("=" * 70)
+        log.append(f"📁 Output File: {output_filename}")
+        log.append("📋 Standards Compliance:")
+        log.append("   ✅ SANS 10131:2004 - Above-ground storage tanks")
+        log.append("   ✅ API 650 - Welded steel tanks for oil storage")
+        log.append("   ✅ ISO 9001 - Quality management systems")
+        log.append("\n🏭 Tank Specifications:")
+        log.append("   🔹 Capacity: 9,000L (9 m³)")
+        log.append("   🔹 Diameter: 1,870 mm")
+        log.append("   🔹 Length: 3,680 mm")
+        log.append("   🔹 Shell Thickness: 6 mm")
+        log.append("   🔹 Material: Carbon Steel Grade 300WA (SANS 1431)")
+        log.append("   🔹 Design Pressure: 2.5 psig")
+        log.append("   🔹 Design Temperature: 60°C")
+        log.append("\n🔧 Components Included:")
+        log.append("   ✓ Cylindrical shell with calculated thickness")
+        log.append("   ✓ Torispherical dished ends")
+        log.append("   ✓ 600mm manhole with flange")
+        log.append("   ✓ Support saddles with proper positioning")
+        log.append("   ✓ Nozzles: Fill (3\"), Vent (2\"), Outlet (2\"), Drain (1\")")
+        log.append("   ✓ Lifting lugs for safe handling")
+        log.append("\n🎯 Ready for:")
+        log.append("   📐 SolidWorks import and detailed design")
+        log.append("   👷 Professional engineering review")
+        log.append("   🏗️ Manufacturing and fabrication")
+        log.append("   📋 Compliance verification")
+        log.append("\n" + "=" * 70)
+        log.append("🏢 Solprov Engineering (Pty) Ltd")
+        log.append("   Professional Engineering Solutions")
+        log.append("   14+ Years Experience | ISO 9001 Certified")
+        log.append("   SAIME & SAQI Members")
+        log.append("=" * 70)
+        sys.stdout.write('\n'.join(log) + '\n')
         
         return True
         
     except Exception as e:
-        print(f"\n❌ Error: {str(e)}")
-        print("💡 Troubleshooting:")
-        print("   - Ensure build123d is properly installed")
-        print("   - Check system requirements")
-        print("   - Verify write permissions in current directory")
+        log.append(f"\n❌ Error: {str(e)}")
+        log.append("💡 Troubleshooting:")
+        log.append("   - Ensure build123d is properly installed")
+        log.append("   - Check system requirements")
+        log.append("   - Verify write permissions in current directory")
+        sys.stdout.write('\n'.join(log) + '\n')
         return False
 
 if __name__ == "__main__":